@@ -9,11 +9,16 @@ Requer: assets/consolidated_12m_expenses.csv (gerado por consolidate_csv.py)
 Gera: index.html na raiz do projeto
 """
 
+import base64
 import csv
+import gzip
+import heapq
+import html
 import json
+import math
+import re
 import sys
 from pathlib import Path
-from collections import defaultdict
 from typing import Optional
 
 SCRIPTS_DIR = Path(__file__).resolve().parent
@@ -21,6 +26,11 @@ if str(SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPTS_DIR))
 from categories import BLACKLIST, MASTER_CATEGORIES, is_blacklisted as _is_blacklisted_cat
 
+try:
+    import orjson  # parser em Rust, bem mais rápido que o json da stdlib
+except ImportError:
+    orjson = None
+
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 CSV_PATH = ASSETS / "consolidated_12m_expenses.csv"
 CONTA_JSON_PATH = ASSETS / "consolidated_conta_corrente_2025.json"
@@ -29,11 +39,46 @@ OUT_HTML = Path(__file__).resolve().parent.parent / "index.html"
 # Teto orçamentário mensal (despesas básicas no cartão, exc. lazer, financiamento, limpeza, investimentos, educação, consórcio)
 BUDGET_MONTHLY = 3125.0
 
+CSS_PATH = ASSETS / "dashboard.css"
+
+# Nomes dos meses indexados por (mês - 1); evita reconstruir um dict a cada chamada
+_MONTH_PT = ("janeiro", "fevereiro", "março", "abril", "maio", "junho",
+             "julho", "agosto", "setembro", "outubro", "novembro", "dezembro")
+
+# Abreviações por "MM" e cores do donut — os mesmos valores usados no JS, para
+# que o HTML renderizado no build seja idêntico ao que o JS reconstruiria
+_MONTH_ABBR = {"01": "Jan", "02": "Fev", "03": "Mar", "04": "Abr", "05": "Mai", "06": "Jun",
+               "07": "Jul", "08": "Ago", "09": "Set", "10": "Out", "11": "Nov", "12": "Dez"}
+_DONUT_COLORS = ("#da3636", "#9e6a03", "#238636", "#58a6ff", "#a371f7")
+
+_BRL_TR = str.maketrans({",": ".", ".": ","})
+
+
+def _fmt_brl(n: float) -> str:
+    """Mesmo formato do fmtMoney no JS: R$ 1.234,56."""
+    return "R$ " + f"{n:,.2f}".translate(_BRL_TR)
+
+
+def _minify_css(css: str) -> str:
+    """Minificador trivial: remove comentários e colapsa espaços em volta da pontuação."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,])\s*", r"\1", css)
+    return css.strip()
+
+
+# Minificado uma vez na importação; o template só interpola a versão compacta
+_MINIFIED_CSS = _minify_css(CSS_PATH.read_text(encoding="utf-8"))
+
+
+# Tradutor pré-compilado para vírgula decimal (mais rápido que .replace por char único)
+_TR = str.maketrans({",": "."})
+
 
 def parse_amount(s: str) -> float:
-    s = (s or "").strip().replace(",", ".")
+    # O CSV consolidado é gerado por nós (sem espaços soltos), então o .strip() é dispensável
     try:
-        return float(s)
+        return float(s.translate(_TR)) if s else 0.0
     except ValueError:
         return 0.0
 
@@ -42,31 +87,36 @@ def is_blacklisted(title: str) -> bool:
     return _is_blacklisted_cat(title)
 
 
+def _kw_re(keywords: list[str]) -> re.Pattern:
+    """Compila uma lista de palavras-chave em uma alternação única (uma varredura só)."""
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+# Pares (padrão, categoria) testados em ordem de prioridade. O grupo de alimentação
+# vira dois padrões — restaurante tem precedência sobre lanche — em vez de re-testar
+# a lista completa para decidir o desempate.
+_CATEGORIA_CARTAO = [
+    (_kw_re(["supermerc", "mercado", "hortifruti", "mercearia", "atacad", "fruteira", "carrefour"]), "Mercado"),
+    (_kw_re(["posto", "gasbom", "gasolina", "abastece"]), "Combustível"),
+    (_kw_re(["uber", "via sul", "concessionaria", "concessionária"]), "Transporte"),
+    (_kw_re(["pedágio", "estacionamento"]), "Pedágio"),
+    (_kw_re(["academia", "prime fit"]), "Academia"),
+    (_kw_re(["farmacia", "farmácia", "panvel", "sao joao", "são joão"]), "Saúde"),
+    (_kw_re(["restaurante", "pizzaria", "buffon", "hamburguer", "rancho", "cia do sabor"]), "Restaurante"),
+    (_kw_re(["ricky", "xis", "lanches", "padaria", "lanchonete", "minhocaburger", "a lenha", "cremolatto", "delivery"]), "Lanche padaria e outros alimentos"),
+    (_kw_re(["google", "youtube", "netflix", "assinatura", "juliocesar", "gemeascel", "conta vivo", "contavivo"]), "Assinaturas"),
+    (_kw_re(["barbeiro", "xbeleza", "beleza", "barbearia"]), "Vestuário e higiene pessoal"),
+    (_kw_re(["rede farroupilha", "estacionamentos"]), "Pedágio"),
+    (_kw_re(["bazar", "havan", "lojas americanas", "leroy", "amazon"]), "Loja e Bazar"),
+]
+
+
 def categorize(title: str) -> str:
     """Atribui categoria por palavras-chave no título; categorias da lista mestra."""
     t = (title or "").lower()
-    if any(k in t for k in ["supermerc", "mercado", "hortifruti", "mercearia", "atacad", "fruteira", "carrefour"]):
-        return "Mercado"
-    if any(k in t for k in ["posto", "gasbom", "gasolina", "abastece"]):
-        return "Combustível"
-    if any(k in t for k in ["uber", "via sul", "concessionaria", "concessionária"]):
-        return "Transporte"
-    if any(k in t for k in ["pedágio", "estacionamento"]):
-        return "Pedágio"
-    if any(k in t for k in ["academia", "prime fit"]):
-        return "Academia"
-    if any(k in t for k in ["farmacia", "farmácia", "panvel", "sao joao", "são joão"]):
-        return "Saúde"
-    if any(k in t for k in ["ricky", "xis", "lanches", "restaurante", "pizzaria", "buffon", "padaria", "lanchonete", "hamburguer", "minhocaburger", "rancho", "a lenha", "cia do sabor", "cremolatto", "delivery"]):
-        return "Restaurante" if any(x in t for x in ["restaurante", "pizzaria", "buffon", "hamburguer", "rancho", "cia do sabor"]) else "Lanche padaria e outros alimentos"
-    if any(k in t for k in ["google", "youtube", "netflix", "assinatura", "juliocesar", "gemeascel", "conta vivo", "contavivo"]):
-        return "Assinaturas"
-    if any(k in t for k in ["barbeiro", "xbeleza", "beleza", "barbearia"]):
-        return "Vestuário e higiene pessoal"
-    if any(k in t for k in ["rede farroupilha", "estacionamentos"]):
-        return "Pedágio"
-    if any(k in t for k in ["bazar", "havan", "lojas americanas", "leroy", "amazon"]):
-        return "Loja e Bazar"
+    for pattern, cat in _CATEGORIA_CARTAO:
+        if pattern.search(t):
+            return cat
     return "Outros"
 
 
@@ -84,6 +134,8 @@ def load_2025_expenses() -> list[dict]:
             amount = parse_amount(row.get("amount") or "0")
             rows.append({
                 "date": date_s,
+                "ym": date_s[:7],
+                "mm": int(date_s[5:7]),
                 "title": title,
                 "amount": round(amount, 2),
                 "category": categorize(title),
@@ -92,9 +144,10 @@ def load_2025_expenses() -> list[dict]:
 
 
 def aggregate_by_title(expenses: list[dict]) -> list[dict]:
-    by_title = defaultdict(float)
+    by_title = {}
     for r in expenses:
-        by_title[r["title"]] += r["amount"]
+        k = r["title"]
+        by_title[k] = by_title.get(k, 0.0) + r["amount"]
     out = [{"title": k, "total": round(v, 2), "count": sum(1 for e in expenses if e["title"] == k)}
            for k, v in by_title.items()]
     out.sort(key=lambda x: -x["total"])
@@ -102,59 +155,53 @@ def aggregate_by_title(expenses: list[dict]) -> list[dict]:
 
 
 def aggregate_by_month(expenses: list[dict]) -> list[dict]:
-    by_month = defaultdict(float)
+    by_month = {}
     for r in expenses:
         month = r["date"][:7]  # 2025-01
-        by_month[month] += r["amount"]
+        by_month[month] = by_month.get(month, 0.0) + r["amount"]
     out = [{"month": k, "total": round(v, 2)} for k, v in sorted(by_month.items())]
     return out
 
 
-def aggregate_by_category(expenses: list[dict]) -> list[dict]:
-    by_cat = defaultdict(float)
+def aggregate_by_category(expenses: list[dict]) -> tuple[list[dict], set[str]]:
+    """Retorna (totais por categoria, conjunto de categorias vistas) em uma única passada."""
+    by_cat = {}
     for r in expenses:
-        by_cat[r["category"]] += r["amount"]
+        k = r["category"]
+        by_cat[k] = by_cat.get(k, 0.0) + r["amount"]
     out = [{"category": k, "total": round(v, 2)} for k, v in by_cat.items()]
     out.sort(key=lambda x: -x["total"])
-    return out
+    return out, set(by_cat)
 
 
 def build_abc(by_title: list[dict], total: float) -> list[dict]:
-    """Adiciona classe ABC (80/20) e % acumulado a by_title."""
+    """Adiciona classe ABC (80/20) e % acumulado a by_title (muta os dicts in place)."""
     if total <= 0:
         return by_title
     cum = 0.0
-    out = []
     for x in by_title:
         cum += x["total"]
         pct = (cum / total) * 100
-        if pct <= 80:
-            cls = "A"
-        elif pct <= 95:
-            cls = "B"
-        else:
-            cls = "C"
-        out.append({**x, "cum_pct": round(pct, 1), "abc": cls})
-    return out
+        x["cum_pct"] = round(pct, 1)
+        x["abc"] = "A" if pct <= 80 else "B" if pct <= 95 else "C"
+    return by_title
 
 
 def over_budget_months(by_month: list[dict]) -> list[dict]:
-    """Meses em que o total ultrapassou o teto BUDGET_MONTHLY."""
-    out = []
-    for m in by_month:
-        if m["total"] > BUDGET_MONTHLY:
-            out.append({
-                "month": m["month"],
-                "total": m["total"],
-                "over_amount": round(m["total"] - BUDGET_MONTHLY, 2),
-            })
-    return out
+    """Meses em que o total ultrapassou o teto BUDGET_MONTHLY (máscara em passada única)."""
+    return [
+        {"month": m["month"], "total": m["total"], "over_amount": round(m["total"] - BUDGET_MONTHLY, 2)}
+        for m in by_month
+        if m["total"] > BUDGET_MONTHLY
+    ]
 
 
 def load_conta_corrente() -> Optional[dict]:
     """Carrega dados da conta corrente se o JSON existir."""
     if not CONTA_JSON_PATH.exists():
         return None
+    if orjson is not None:
+        return orjson.loads(CONTA_JSON_PATH.read_bytes())
     with open(CONTA_JSON_PATH, encoding="utf-8") as f:
         return json.load(f)
 
@@ -163,13 +210,19 @@ def build_conta_payload(conta_data: dict, total_cartao: float = 0) -> dict:
     """Monta payload para a aba Conta Corrente: by_month, by_entity_abc, by_category.
     total_cartao: total contabilizado do cartão; usado para categoria 'Pagamento cartão' alinhar ao cartão."""
     transactions = conta_data.get("transactions", [])
+    # Coluna derivada materializada uma vez: o JS usa t.ym em vez de refatiar
+    # t.date.slice(0, 7) a cada render
+    for t in transactions:
+        ym = (t.get("date") or "")[:7]
+        t["ym"] = ym
+        t["mm"] = int(ym[5:7]) if len(ym) == 7 else 0
     meta = conta_data.get("meta", {})
     saidas = [t for t in transactions if t.get("amount", 0) < 0]
     # Por entidade (saídas): total em valor absoluto para ABC
-    by_entity_sum = defaultdict(float)
+    by_entity_sum = {}
     for t in saidas:
         ent = (t.get("entity") or "Outros").strip()
-        by_entity_sum[ent] += abs(t["amount"])
+        by_entity_sum[ent] = by_entity_sum.get(ent, 0.0) + abs(t["amount"])
     by_entity = [
         {"title": k, "total": round(v, 2)}
         for k, v in sorted(by_entity_sum.items(), key=lambda x: -x[1])
@@ -178,10 +231,21 @@ def build_conta_payload(conta_data: dict, total_cartao: float = 0) -> dict:
     by_entity_abc = build_abc(by_entity, total_saidas) if total_saidas > 0 else []
 
     # Por categoria (saídas); "Pagamento cartão" = total_cartao para refletir o mesmo valor do cartão
-    by_cat_sum = defaultdict(float)
+    by_cat_sum = {}
     for t in saidas:
         cat = (t.get("category") or "Outros").strip()
-        by_cat_sum[cat] += abs(t["amount"])
+        by_cat_sum[cat] = by_cat_sum.get(cat, 0.0) + abs(t["amount"])
+    # Versão sem o ajuste de "Pagamento cartão" — é o que o JS recomputaria do zero
+    by_category_raw = [
+        {"category": k, "total": round(v, 2)}
+        for k, v in sorted(by_cat_sum.items(), key=lambda x: -x[1])
+    ]
+    # Top-5 da rosca: das somas cruas, antes do ajuste — o fallback do JS é
+    # by_category.slice(0, 5) sobre os mesmos valores crus
+    top_categories = [
+        {"category": k, "total": round(v, 2)}
+        for k, v in heapq.nlargest(5, by_cat_sum.items(), key=lambda kv: kv[1])
+    ]
     if total_cartao and "Pagamento cartão" in by_cat_sum:
         by_cat_sum["Pagamento cartão"] = round(total_cartao, 2)
     by_category = [
@@ -190,29 +254,62 @@ def build_conta_payload(conta_data: dict, total_cartao: float = 0) -> dict:
     ]
 
     # Por mês: entradas e saídas
-    by_month_ent = defaultdict(float)
-    by_month_sai = defaultdict(float)
+    by_month_ent = {}
+    by_month_sai = {}
     for t in transactions:
         month = (t.get("date") or "")[:7]
         if not month:
             continue
         amt = t.get("amount", 0)
         if amt > 0:
-            by_month_ent[month] += amt
+            by_month_ent[month] = by_month_ent.get(month, 0.0) + amt
         else:
-            by_month_sai[month] += abs(amt)
+            by_month_sai[month] = by_month_sai.get(month, 0.0) + abs(amt)
     months = sorted(set(by_month_ent) | set(by_month_sai))
     by_month = [
         {
             "month": m,
-            "entradas": round(by_month_ent[m], 2),
-            "saidas": round(by_month_sai[m], 2),
-            "saldo": round(by_month_ent[m] - by_month_sai[m], 2),
+            "entradas": round(by_month_ent.get(m, 0.0), 2),
+            "saidas": round(by_month_sai.get(m, 0.0), 2),
+            "saldo": round(by_month_ent.get(m, 0.0) - by_month_sai.get(m, 0.0), 2),
         }
         for m in months
     ]
 
-    all_categories = sorted({c["category"] for c in by_category} | {"Outros"})
+    # Top-5 para os gráficos rosca: nlargest é O(G log 5) e dispensa reordenar no frontend
+    top_entities = [
+        {"title": k, "total": round(v, 2)}
+        for k, v in heapq.nlargest(5, by_entity_sum.items(), key=lambda kv: kv[1])
+    ]
+
+    # Forma colunar (SoA) das transações para os loops quentes do JS: valores
+    # contíguos e categoria/entidade como índice em dicionários de strings,
+    # em vez de um objeto com strings repetidas por linha
+    cat_dict = []
+    cat_pos = {}
+    ent_dict = []
+    ent_pos = {}
+    col_amount = []
+    col_mm = []
+    col_cat = []
+    col_ent = []
+    for t in transactions:
+        col_amount.append(t.get("amount", 0))
+        col_mm.append(t.get("mm", 0))
+        cat = (t.get("category") or "Outros").strip()
+        ci = cat_pos.get(cat)
+        if ci is None:
+            ci = cat_pos[cat] = len(cat_dict)
+            cat_dict.append(cat)
+        col_cat.append(ci)
+        ent = (t.get("entity") or "Outros").strip()
+        ei = ent_pos.get(ent)
+        if ei is None:
+            ei = ent_pos[ent] = len(ent_dict)
+            ent_dict.append(ent)
+        col_ent.append(ei)
+
+    all_categories = sorted(by_cat_sum.keys() | {"Outros"})
     return {
         "year": 2025,
         "entradas_total": meta.get("entradas_total", 0),
@@ -223,6 +320,18 @@ def build_conta_payload(conta_data: dict, total_cartao: float = 0) -> dict:
         "by_entity": by_entity_abc,
         "by_category": by_category,
         "by_month": by_month,
+        "top_entities": top_entities,
+        "top_categories": top_categories,
+        "precomputed": {
+            "entradas_total": meta.get("entradas_total", 0),
+            "saidas_total": meta.get("saidas_total", 0),
+            "by_month": by_month,
+            "by_entity": by_entity_abc,
+            "by_category": by_category_raw,
+        },
+        "transactions_cols": {"amount": col_amount, "mm": col_mm, "cat_idx": col_cat, "ent_idx": col_ent},
+        "cat_dict": cat_dict,
+        "ent_dict": ent_dict,
         "master_categories": MASTER_CATEGORIES,
         "all_categories": all_categories,
     }
@@ -240,8 +349,10 @@ def build_recommendations(
         n = len(over_budget)
         worst = max(over_budget, key=lambda x: x["over_amount"])
         mm = worst["month"]
-        label = {"01": "janeiro", "02": "fevereiro", "03": "março", "04": "abril", "05": "maio", "06": "junho",
-                 "07": "julho", "08": "agosto", "09": "setembro", "10": "outubro", "11": "novembro", "12": "dezembro"}.get(mm[-2:], mm)
+        try:
+            label = _MONTH_PT[int(mm[-2:]) - 1]
+        except (ValueError, IndexError):
+            label = mm
         lines.append(f"Em {n} dos 12 meses o gasto no cartão ultrapassou o teto de R$ 3.125,00. O pior foi em {label}, com R$ {worst['over_amount']:.2f} acima do teto. Vale definir alertas ou revisar compras na segunda quinzena quando estiver se aproximando do limite.")
     if by_category:
         top3 = by_category[:3]
@@ -252,6 +363,116 @@ def build_recommendations(
     return lines
 
 
+def render_initial_cartao(payload: dict) -> dict:
+    """Renderiza no build o estado inicial (sem overrides/filtros) da aba cartão.
+
+    Devolve os trechos de HTML que o template injeta direto; o JS só refaz
+    essas seções quando o usuário edita ou filtra alguma coisa."""
+    esc = html.escape
+    fmt = _fmt_brl
+    by_month = payload["by_month"]
+    by_title = payload["by_title"]
+    by_category = payload["by_category"]
+
+    # Barras mensais — mesma conta do renderAll no JS
+    max_val = max([BUDGET_MONTHLY] + [m["total"] for m in by_month]) or 1
+    bar_h = 160
+    cols = []
+    for m in by_month:
+        h = (m["total"] / max_val) * bar_h if max_val > 0 else 0
+        over = m["total"] > BUDGET_MONTHLY
+        label = _MONTH_ABBR.get(m["month"][5:7], m["month"][5:7])
+        title = fmt(m["total"]) + (" (acima do teto)" if over else "")
+        cols.append(
+            f'<div class="col"><span class="bar {"over" if over else "under"}" '
+            f'style="height:{max(4.0, h):g}px" title="{title}"></span>'
+            f'<span class="label{" over" if over else ""}">{label}</span></div>'
+        )
+    ref_bottom = 24 + (BUDGET_MONTHLY / max_val) * bar_h
+    month_bars = "".join(cols) + (
+        f'<div class="ref-line" style="bottom:{ref_bottom:g}px" title="Teto {fmt(BUDGET_MONTHLY)}"></div>'
+    )
+
+    over_b = payload["over_budget_months"]
+    if over_b:
+        lis = "".join(
+            f'<li>{_MONTH_ABBR.get(m["month"][5:7], m["month"])}: {fmt(m["total"])} '
+            f'(+{fmt(m["over_amount"])} acima do teto)</li>'
+            for m in over_b
+        )
+        over_html = f"<ul>{lis}</ul>"
+    else:
+        over_html = '<p class="none">Nenhum mês ultrapassou o teto de R$ 3.125,00.</p>'
+
+    by_cat_html = "".join(
+        f'<span>{esc(c["category"])} <strong>{fmt(c["total"])}</strong></span>' for c in by_category
+    )
+
+    # Donut como SVG com stroke-dasharray (mesma geometria do renderDonut do JS)
+    circ = 2 * math.pi * 45
+
+    def donut(top5, key):
+        if not top5:
+            return ('<svg viewBox="0 0 120 120"><circle cx="60" cy="60" r="45" fill="none" '
+                    'stroke="#21262d" stroke-width="15"></circle></svg>', "")
+        total = sum(x["total"] for x in top5)
+        circles = []
+        cum = 0.0
+        for i, x in enumerate(top5):
+            frac = (x["total"] / total) if total > 0 else 0
+            circles.append(
+                f'<circle cx="60" cy="60" r="45" fill="none" stroke="{_DONUT_COLORS[i % len(_DONUT_COLORS)]}" '
+                f'stroke-width="15" stroke-dasharray="{frac * circ:g} {circ:g}" '
+                f'stroke-dashoffset="{-cum * circ:g}" transform="rotate(-90 60 60)"></circle>'
+            )
+            cum += frac
+        legend = "".join(
+            f'<li><span class="dot" style="background:{_DONUT_COLORS[i % len(_DONUT_COLORS)]}"></span>'
+            f'<span class="label">{esc(x[key])}</span><span class="val">{fmt(x["total"])}</span></li>'
+            for i, x in enumerate(top5)
+        )
+        return f'<svg viewBox="0 0 120 120">{"".join(circles)}</svg>', legend
+
+    donut_entity_svg, donut_entity_legend = donut(by_title[:5], "title")
+    donut_cat_svg, donut_cat_legend = donut(by_category[:5], "category")
+
+    groups = []
+    for cls in ("A", "B", "C"):
+        items = [r for r in by_title if r["abc"] == cls]
+        total_cls = round(sum(r["total"] for r in items), 2)
+        rows = "".join(
+            f'<tr class="abc-{r["abc"]}"><td>{esc(r["title"])}</td>'
+            f'<td class="amount">{fmt(r["total"])}</td><td>{r["cum_pct"]:g}%</td></tr>'
+            for r in items
+        )
+        groups.append(
+            f'<div class="abc-group"><div class="abc-group-header"><span>Classe {cls} '
+            f'<span class="abc-badge {cls}">{cls}</span> — {len(items)} itens</span>'
+            f'<span class="toggle">Total: {fmt(total_cls)} ▶</span></div>'
+            f'<div class="abc-group-body collapsed"><table class="abc-table">'
+            f'<thead><tr><th>Estabelecimento</th><th>Total (R$)</th><th>% Acum.</th></tr></thead>'
+            f'<tbody>{rows}</tbody></table></div></div>'
+        )
+
+    by_title_html = "".join(
+        f'<li><span class="name">{esc(x["title"])}</span><span class="val">{fmt(x["total"])}</span></li>'
+        for x in by_title
+    )
+
+    return {
+        "month_bars": month_bars,
+        "over_budget": over_html,
+        "by_category": by_cat_html,
+        "donut_entity_svg": donut_entity_svg,
+        "donut_entity_legend": donut_entity_legend,
+        "donut_cat_svg": donut_cat_svg,
+        "donut_cat_legend": donut_cat_legend,
+        "abc_groups": "".join(groups),
+        "by_title": by_title_html,
+        "recommendations": "".join(f"<li>{esc(t)}</li>" for t in payload["recommendations"]),
+    }
+
+
 def main():
     if not CSV_PATH.exists():
         print(f"Arquivo não encontrado: {CSV_PATH}")
@@ -265,7 +486,7 @@ def main():
 
     by_title = aggregate_by_title(expenses)
     by_month = aggregate_by_month(expenses)
-    by_category = aggregate_by_category(expenses)
+    by_category, cats_seen = aggregate_by_category(expenses)
     total_2025 = round(sum(e["amount"] for e in expenses), 2)
     months_with_data = len(by_month) or 1
     avg_monthly = round(total_2025 / months_with_data, 2)
@@ -274,7 +495,7 @@ def main():
     over_budget = over_budget_months(by_month)
     recommendations = build_recommendations(by_category, by_month, over_budget, total_2025)
 
-    all_categories = sorted({c["category"] for c in by_category} | {"Outros"})
+    all_categories = sorted(cats_seen | {"Outros"})
     payload = {
         "year": 2025,
         "budget_monthly": BUDGET_MONTHLY,
@@ -291,12 +512,19 @@ def main():
         "all_categories": all_categories,
         "master_categories": MASTER_CATEGORIES,
         "months_count": months_with_data,
+        # Estado base (sem overrides/filtros) pré-agregado: o JS só aplica o delta
+        # das linhas editadas em vez de reagregar as N despesas a cada render
+        "precomputed": {
+            "total": total_2025,
+            "count": len(expenses),
+            "by_month": {m["month"]: m["total"] for m in by_month},
+            "by_title": {x["title"]: x["total"] for x in by_title_abc},
+            "by_category": {c["category"]: c["total"] for c in by_category},
+        },
     }
-    data_js = json.dumps(payload, ensure_ascii=False)
 
     conta_raw = load_conta_corrente()
     payload_conta = build_conta_payload(conta_raw, total_2025) if conta_raw else None
-    data_conta_js = json.dumps(payload_conta, ensure_ascii=False) if payload_conta else "null"
 
     # Consolidado: DRE (receitas - despesas) e DFC (fluxo mensal)
     receitas_consolidado = payload_conta["entradas_total"] if payload_conta else 0
@@ -313,111 +541,31 @@ def main():
         "by_category_cartao": by_category,
         "by_category_conta": payload_conta["by_category"] if payload_conta else [],
     }
-    data_consolidado_js = json.dumps(payload_consolidado, ensure_ascii=False)
-
-    html = f"""<!DOCTYPE html>
+    # Um blob único gzip+base64 com os três payloads: JSON de transações é
+    # repetitivo (datas, categorias) e comprime 5-10x; mtime=0 mantém a saída
+    # determinística entre builds
+    data_gz_b64 = base64.b64encode(
+        gzip.compress(
+            json.dumps(
+                {"main": payload, "conta": payload_conta, "consolidado": payload_consolidado},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode("utf-8"),
+            mtime=0,
+        )
+    ).decode("ascii")
+
+    init = render_initial_cartao(payload)
+    count_fmt = f"{len(expenses):,}".replace(",", ".")
+
+    html_doc = f"""<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
   <meta charset="UTF-8">
   <meta name="viewport" content="width=device-width, initial-scale=1">
   <title>Finfeed — Cartão, Conta Corrente e DRE 2025 - Rodrigo</title>
   <style>
-    :root {{ font-family: 'Segoe UI', system-ui, sans-serif; background: #0f1419; color: #e6edf3; }}
-    * {{ box-sizing: border-box; }}
-    body {{ max-width: 1200px; margin: 0 auto; padding: 1.5rem; }}
-    .tabs-nav {{ display: flex; gap: 0.5rem; margin-bottom: 1.5rem; border-bottom: 1px solid #30363d; padding-bottom: 0; }}
-    .tabs-nav button {{ background: transparent; border: none; border-bottom: 2px solid transparent; color: #8b949e; padding: 0.6rem 1rem; font-size: 0.95rem; cursor: pointer; margin-bottom: -1px; }}
-    .tabs-nav button:hover {{ color: #e6edf3; }}
-    .tabs-nav button.active {{ color: #58a6ff; border-bottom-color: #58a6ff; }}
-    .tab-pane {{ display: none; }}
-    .tab-pane.active {{ display: block; }}
-    h1 {{ font-size: 1.4rem; font-weight: 600; margin-bottom: 0.25rem; }}
-    .subtitle {{ color: #8b949e; font-size: 0.9rem; margin-bottom: 0.5rem; }}
-    .notice {{ background: #161b22; border: 1px solid #30363d; border-radius: 8px; padding: 1rem; margin-bottom: 1.5rem; font-size: 0.85rem; color: #8b949e; line-height: 1.5; }}
-    .notice strong {{ color: #e6edf3; }}
-    .over-teto {{ margin-bottom: 1.5rem; }}
-    .over-teto ul {{ margin: 0; padding-left: 1.25rem; color: #f85149; }}
-    .over-teto .none {{ color: #238636; }}
-    .cards {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(140px, 1fr)); gap: 1rem; margin-bottom: 2rem; }}
-    .card {{ background: #161b22; border: 1px solid #30363d; border-radius: 8px; padding: 1rem; }}
-    .card .label {{ color: #8b949e; font-size: 0.75rem; text-transform: uppercase; letter-spacing: 0.05em; }}
-    .card .value {{ font-size: 1.15rem; font-weight: 600; margin-top: 0.25rem; }}
-    .card .value.total {{ color: #f85149; }}
-    section {{ margin-bottom: 2rem; }}
-    section h2 {{ font-size: 1.1rem; color: #8b949e; margin-bottom: 0.75rem; font-weight: 600; }}
-    .filters {{ display: flex; flex-wrap: wrap; gap: 0.75rem; align-items: center; margin-bottom: 1rem; }}
-    .filters label {{ color: #8b949e; font-size: 0.85rem; }}
-    .filters select {{ padding: 0.4rem 0.6rem; background: #161b22; border: 1px solid #30363d; border-radius: 6px; color: #e6edf3; font-size: 0.9rem; }}
-    .filters input[type="text"] {{ padding: 0.5rem 0.75rem; background: #161b22; border: 1px solid #30363d; border-radius: 6px; color: #e6edf3; font-size: 0.9rem; width: 220px; }}
-    table {{ width: 100%; border-collapse: collapse; font-size: 0.9rem; }}
-    th, td {{ text-align: left; padding: 0.5rem 0.75rem; border-bottom: 1px solid #30363d; }}
-    th {{ color: #8b949e; font-weight: 500; cursor: pointer; user-select: none; white-space: nowrap; }}
-    th:hover {{ color: #e6edf3; }}
-    th.sorted-asc::after {{ content: ' ▲'; font-size: 0.7em; }}
-    th.sorted-desc::after {{ content: ' ▼'; font-size: 0.7em; }}
-    td.amount {{ text-align: right; font-variant-numeric: tabular-nums; color: #f85149; }}
-    .table-wrap {{ overflow-x: auto; }}
-    .top-list {{ list-style: none; padding: 0; margin: 0; }}
-    .top-list li {{ display: flex; justify-content: space-between; align-items: center; padding: 0.4rem 0; border-bottom: 1px solid #21262d; gap: 1rem; }}
-    .top-list .name {{ flex: 1; min-width: 0; overflow: hidden; text-overflow: ellipsis; }}
-    .top-list .val {{ color: #f85149; font-variant-numeric: tabular-nums; }}
-    .month-bars {{ position: relative; display: flex; align-items: flex-end; gap: 6px; height: 200px; margin-top: 0.5rem; padding-bottom: 24px; }}
-    .month-bars .col {{ flex: 1; display: flex; flex-direction: column; align-items: center; min-width: 0; position: relative; }}
-    .month-bars .bar {{ width: 100%; max-width: 36px; border-radius: 4px 4px 0 0; min-height: 4px; }}
-    .month-bars .bar.under {{ background: #238636; }}
-    .month-bars .bar.over {{ background: #da3636; }}
-    .month-bars .label {{ font-size: 0.7rem; color: #8b949e; margin-top: 6px; }}
-    .month-bars .label.over {{ color: #f85149; font-weight: 600; }}
-    .month-bars .ref-line {{ position: absolute; left: 0; right: 0; bottom: 0; height: 2px; background: #9e6a03; opacity: 0.8; }}
-    .budget-legend {{ font-size: 0.75rem; color: #8b949e; margin-top: 4px; }}
-    .category-list {{ display: flex; flex-wrap: wrap; gap: 0.5rem; margin-bottom: 1rem; }}
-    .category-list span {{ background: #21262d; padding: 0.35rem 0.6rem; border-radius: 6px; font-size: 0.85rem; color: #8b949e; }}
-    .category-list span strong {{ color: #f85149; margin-left: 4px; }}
-    .abc-table {{ font-size: 0.85rem; }}
-    .abc-table td {{ padding: 0.35rem 0.5rem; }}
-    .abc-A {{ background: rgba(210, 80, 80, 0.15); }}
-    .abc-B {{ background: rgba(210, 160, 80, 0.12); }}
-    .abc-C {{ background: rgba(80, 120, 80, 0.1); }}
-    .abc-badge {{ display: inline-block; width: 20px; text-align: center; font-weight: 700; font-size: 0.75rem; border-radius: 3px; }}
-    .abc-badge.A {{ background: #da3636; color: #fff; }}
-    .abc-badge.B {{ background: #9e6a03; color: #fff; }}
-    .abc-badge.C {{ background: #238636; color: #fff; }}
-    .abc-group {{ margin-bottom: 0.5rem; }}
-    .abc-group-header {{ cursor: pointer; background: #21262d; padding: 0.5rem 0.75rem; border-radius: 6px; display: flex; justify-content: space-between; align-items: center; font-weight: 600; user-select: none; }}
-    .abc-group-header:hover {{ background: #30363d; }}
-    .abc-group-header .toggle {{ font-size: 0.8rem; color: #8b949e; }}
-    .abc-group-body {{ overflow: hidden; }}
-    .abc-group-body.collapsed {{ display: none; }}
-    .abc-group-body table {{ margin-top: 0; }}
-    .conclusion {{ background: #161b22; border: 1px solid #30363d; border-radius: 8px; padding: 1.25rem; margin-top: 2rem; }}
-    .conclusion h2 {{ margin-top: 0; }}
-    .conclusion ul {{ margin: 0.5rem 0 0 1.25rem; padding: 0; line-height: 1.6; color: #c9d1d9; }}
-    td select {{ padding: 0.25rem 0.4rem; background: #161b22; border: 1px solid #30363d; border-radius: 4px; color: #e6edf3; font-size: 0.85rem; max-width: 100%; }}
-    td select:focus {{ outline: none; border-color: #58a6ff; }}
-    tr.hidden-row {{ opacity: 0.5; background: #0d1117; }}
-    .donut-charts {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(260px, 1fr)); gap: 1.5rem; margin-top: 1rem; }}
-    .donut-wrap {{ display: flex; flex-direction: column; align-items: center; }}
-    .donut-wrap .donut-outer {{ width: 200px; height: 200px; border-radius: 50%; position: relative; flex-shrink: 0; }}
-    .donut-wrap .donut-hole {{ position: absolute; top: 50%; left: 50%; width: 55%; height: 55%; margin: -27.5% 0 0 -27.5%; background: #0f1419; border-radius: 50%; }}
-    .donut-legend {{ list-style: none; padding: 0; margin: 0.75rem 0 0 0; font-size: 0.8rem; }}
-    .donut-legend li {{ display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.35rem; }}
-    .donut-legend .dot {{ width: 10px; height: 10px; border-radius: 50%; flex-shrink: 0; }}
-    .donut-legend .label {{ flex: 1; min-width: 0; overflow: hidden; text-overflow: ellipsis; }}
-    .donut-legend .val {{ color: #f85149; font-variant-numeric: tabular-nums; }}
-    .dre-dfc-print {{ background: #fff; color: #24292f; padding: 1.5rem; border-radius: 8px; margin-top: 1.5rem; border: 1px solid #d0d7de; }}
-    .dre-dfc-print h2 {{ font-size: 1.1rem; color: #24292f; margin: 1rem 0 0.5rem 0; }}
-    .dre-dfc-print h2:first-child {{ margin-top: 0; }}
-    .dre-dfc-print table {{ width: 100%; border-collapse: collapse; font-size: 0.9rem; margin-bottom: 1rem; }}
-    .dre-dfc-print th, .dre-dfc-print td {{ border: 1px solid #d0d7de; padding: 0.5rem 0.75rem; text-align: left; }}
-    .dre-dfc-print th {{ background: #f6f8fa; font-weight: 600; }}
-    .dre-dfc-print td.amount {{ text-align: right; font-variant-numeric: tabular-nums; }}
-    .dre-dfc-print .total-row {{ font-weight: 600; background: #f6f8fa; }}
-    @media print {{
-      body * {{ visibility: hidden; }}
-      .dre-dfc-print, .dre-dfc-print * {{ visibility: visible; }}
-      .dre-dfc-print {{ position: absolute; left: 0; top: 0; width: 100%; max-width: none; background: #fff; color: #24292f; border: none; padding: 1rem; }}
-      @page {{ size: landscape; margin: 1.5cm; }}
-    }}
+{_MINIFIED_CSS}
   </style>
 </head>
 <body>
@@ -445,36 +593,36 @@ def main():
   <div class="cards">
     <div class="card">
       <div class="label">Total 2025</div>
-      <div class="value total" id="total-year">—</div>
+      <div class="value total" id="total-year">{_fmt_brl(total_2025)}</div>
     </div>
     <div class="card">
       <div class="label">Média mensal</div>
-      <div class="value" id="avg-monthly">—</div>
+      <div class="value" id="avg-monthly">{_fmt_brl(avg_monthly)}</div>
     </div>
     <div class="card">
       <div class="label">Média semanal</div>
-      <div class="value" id="avg-weekly">—</div>
+      <div class="value" id="avg-weekly">{_fmt_brl(avg_weekly)}</div>
     </div>
     <div class="card">
       <div class="label">Lançamentos</div>
-      <div class="value" id="count-year">—</div>
+      <div class="value" id="count-year">{count_fmt}</div>
     </div>
   </div>
 
   <section>
     <h2>Total por mês (barras) · Teto R$ 3.125</h2>
-    <div class="month-bars" id="month-bars"></div>
+    <div class="month-bars" id="month-bars">{init['month_bars']}</div>
     <p class="budget-legend">Linha laranja = teto. Barras vermelhas = mês acima do teto.</p>
   </section>
 
   <section class="over-teto">
     <h2>Meses que ultrapassaram o teto de R$ 3.125</h2>
-    <div id="over-budget-list"></div>
+    <div id="over-budget-list">{init['over_budget']}</div>
   </section>
 
   <section>
     <h2>Principais categorias</h2>
-    <div class="category-list" id="by-category"></div>
+    <div class="category-list" id="by-category">{init['by_category']}</div>
   </section>
 
   <section>
@@ -482,13 +630,13 @@ def main():
     <div class="donut-charts">
       <div class="donut-wrap">
         <h3 style="font-size:0.95rem; color:#8b949e; margin-bottom:0.5rem;">Por entidade (estabelecimento)</h3>
-        <div id="donut-entity" class="donut-outer"></div>
-        <ul id="donut-entity-legend" class="donut-legend"></ul>
+        <div id="donut-entity" class="donut-outer">{init['donut_entity_svg']}</div>
+        <ul id="donut-entity-legend" class="donut-legend">{init['donut_entity_legend']}</ul>
       </div>
       <div class="donut-wrap">
         <h3 style="font-size:0.95rem; color:#8b949e; margin-bottom:0.5rem;">Por categoria</h3>
-        <div id="donut-category" class="donut-outer"></div>
-        <ul id="donut-category-legend" class="donut-legend"></ul>
+        <div id="donut-category" class="donut-outer">{init['donut_cat_svg']}</div>
+        <ul id="donut-category-legend" class="donut-legend">{init['donut_cat_legend']}</ul>
       </div>
     </div>
   </section>
@@ -496,12 +644,12 @@ def main():
   <section>
     <h2>Mapa ABC (80/20) — onde estão os maiores gastos</h2>
     <p style="color:#8b949e; font-size:0.85rem; margin-bottom:0.75rem;">A = até 80% do total · B = 80–95% · C = resto. Clique no grupo para expandir/recolher.</p>
-    <div id="abc-groups"></div>
+    <div id="abc-groups">{init['abc_groups']}</div>
   </section>
 
   <section>
     <h2>Principais gastos por estabelecimento</h2>
-    <ul class="top-list" id="by-title"></ul>
+    <ul class="top-list" id="by-title">{init['by_title']}</ul>
   </section>
 
   <section>
@@ -516,7 +664,7 @@ def main():
       <select id="filter-categories-cartao" multiple title="Segure Ctrl para múltiplas"><option value="">—</option></select>
       <input type="text" id="search" placeholder="Buscar por data, estabelecimento ou valor...">
     </div>
-    <div class="table-wrap">
+    <div class="table-wrap virtual" id="expenses-table-scroll">
       <table id="expenses-table">
         <thead>
           <tr>
@@ -529,13 +677,14 @@ def main():
         </thead>
         <tbody id="tbody"></tbody>
       </table>
+      <template id="row-tmpl"><tr><td></td><td></td><td></td><td class="amount"></td><td><select class="count-select"><option value="1">Sim</option><option value="0">Não</option></select></td></tr></template>
     </div>
   </section>
 
   <section class="conclusion">
     <h2>Onde nos atentar mais para controlar melhor os gastos em 2026</h2>
     <p style="margin:0 0 0.5rem 0; color:#8b949e;">Este foi o histórico de 2025 no cartão. Com base nos dados:</p>
-    <ul id="recommendations"></ul>
+    <ul id="recommendations">{init['recommendations']}</ul>
   </section>
   </div>
 
@@ -589,7 +738,7 @@ def main():
         <label>Categorias (totais/gráficos):</label><select id="filter-categories-conta" multiple title="Segure Ctrl para múltiplas"><option value="">—</option></select>
         <input type="text" id="conta-search" placeholder="Buscar por data, entidade ou valor...">
       </div>
-      <div class="table-wrap">
+      <div class="table-wrap virtual" id="conta-table-scroll">
         <table id="conta-expenses-table">
           <thead><tr><th data-sort="date">Data</th><th data-sort="entity">Entidade</th><th>Categoria</th><th data-sort="amount">Valor (R$)</th><th>Ocultar</th></tr></thead>
           <tbody id="conta-tbody"></tbody>
@@ -638,10 +787,26 @@ def main():
     </section>
   </div>
 
+  <!-- Payloads gzip+base64: bytes no arquivo caem ~5-10x; o cliente descomprime
+       com DecompressionStream e faz JSON.parse (mais rápido que avaliar JS) -->
+  <script id="p-gz" type="application/octet-stream">{data_gz_b64}</script>
+
   <script>
-    const PAYLOAD = {data_js};
-    const PAYLOAD_CONTA = {data_conta_js};
-    const PAYLOAD_CONSOLIDADO = {data_consolidado_js};
+  (async function () {{
+    const _b64 = document.getElementById('p-gz').textContent.trim();
+    const _bytes = Uint8Array.from(atob(_b64), function (c) {{ return c.charCodeAt(0); }});
+    const _payloads = JSON.parse(await new Response(new Blob([_bytes]).stream().pipeThrough(new DecompressionStream('gzip'))).text());
+    const PAYLOAD = _payloads.main;
+    const PAYLOAD_CONTA = _payloads.conta;
+    const PAYLOAD_CONSOLIDADO = _payloads.consolidado;
+    if (PAYLOAD_CONTA && PAYLOAD_CONTA.transactions_cols) {{
+      // Colunas numéricas viram typed arrays: agregação vira loop numérico puro
+      var _tc = PAYLOAD_CONTA.transactions_cols;
+      _tc.amount = Float64Array.from(_tc.amount);
+      _tc.mm = Int32Array.from(_tc.mm);
+      _tc.cat_idx = Int32Array.from(_tc.cat_idx);
+      _tc.ent_idx = Int32Array.from(_tc.ent_idx);
+    }}
     var OVERRIDES_KEY = 'finfeed_overrides_2025';
     var OVERRIDES_CONTA_KEY = 'finfeed_overrides_conta_2025';
     var overridesConta = {{}};
@@ -649,16 +814,37 @@ def main():
       var savedConta = localStorage.getItem(OVERRIDES_CONTA_KEY);
       if (savedConta) overridesConta = JSON.parse(savedConta);
     }} catch (e) {{}}
-    function saveOverridesConta() {{ try {{ localStorage.setItem(OVERRIDES_CONTA_KEY, JSON.stringify(overridesConta)); }} catch (e) {{}} }}
+    var overridesContaVersion = 0;
+    function saveOverridesConta() {{ overridesContaVersion++; try {{ localStorage.setItem(OVERRIDES_CONTA_KEY, JSON.stringify(overridesConta)); }} catch (e) {{}} }}
 
+    // Cache LRU pequeno para memoizar os agregados puros (chave: versão dos overrides + filtros)
+    function makeLRU(cap) {{
+      var m = new Map();
+      return {{
+        get: function (k) {{ return m.get(k); }},
+        set: function (k, v) {{ if (m.size >= cap) m.delete(m.keys().next().value); m.set(k, v); }}
+      }};
+    }}
+    var _recalcCache = makeLRU(32);
+    var _contaAggCache = makeLRU(32);
+
+    // Formatter único + memoização por centavos: os mesmos valores se repetem muito
+    // (teto, totais por mês, linhas idênticas) e toLocaleString reparseia as opções a cada chamada
+    var FMT_BRL = new Intl.NumberFormat('pt-BR', {{ minimumFractionDigits: 2, maximumFractionDigits: 2 }});
+    var _fmtCache = new Map();
     function fmtMoney(n) {{
-      return 'R$ ' + n.toLocaleString('pt-BR', {{ minimumFractionDigits: 2, maximumFractionDigits: 2 }});
+      var k = Math.round(n * 100);
+      var v = _fmtCache.get(k);
+      if (v !== undefined) return v;
+      v = 'R$ ' + FMT_BRL.format(n);
+      if (_fmtCache.size < 5000) _fmtCache.set(k, v);
+      return v;
     }}
 
+    var HTML_ESC = {{ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }};
     function escapeHtml(s) {{
-      var div = document.createElement('div');
-      div.textContent = s;
-      return div.innerHTML;
+      // Escape puro em string: sem nó DOM descartável por chamada
+      return String(s).replace(/[&<>"']/g, function (c) {{ return HTML_ESC[c]; }});
     }}
 
     var monthNames = {{ '01':'Jan','02':'Fev','03':'Mar','04':'Abr','05':'Mai','06':'Jun','07':'Jul','08':'Ago','09':'Set','10':'Out','11':'Nov','12':'Dez' }};
@@ -671,15 +857,62 @@ def main():
       if (saved) overrides = JSON.parse(saved);
     }} catch (e) {{}}
 
-    function saveOverrides() {{ try {{ localStorage.setItem(OVERRIDES_KEY, JSON.stringify(overrides)); }} catch (e) {{}} }}
-
+    var overridesVersion = 0;
+    function saveOverrides() {{ overridesVersion++; try {{ localStorage.setItem(OVERRIDES_KEY, JSON.stringify(overrides)); }} catch (e) {{}} }}
+
+    // Linhas efetivas em cache: montadas uma vez (já com os overrides salvos) e
+    // atualizadas pontualmente quando um override muda — O(1) por edição em vez
+    // de realocar os N objetos a cada chamada
+    var _effCache = null;
+    var _catSelProto = null;
+    function effCache() {{
+      if (_effCache === null) {{
+        _effCache = PAYLOAD.expenses.map(function (r, i) {{
+          return {{ date: r.date, ym: r.ym, mm: r.mm, title: r.title, amount: r.amount, category: getRowCategory(i), _count: getRowCount(i), _idx: i }};
+        }});
+      }}
+      return _effCache;
+    }}
     function getEffectiveExpenses() {{
-      return PAYLOAD.expenses.map(function (r, i) {{
-        var o = overrides[i];
-        var cat = (o && o.category !== undefined) ? o.category : (r.category || 'Outros');
-        var count = (o && o.count !== undefined) ? o.count : true;
-        return {{ date: r.date, title: r.title, amount: r.amount, category: cat, _count: count, _idx: i }};
-      }}).filter(function (r) {{ return r._count; }});
+      return effCache().filter(function (r) {{ return r._count; }});
+    }}
+    // Projeção SoA (arrays paralelos primitivos) das mesmas linhas: a tabela
+    // filtra/ordena índices em vez de objetos, sem alocação por render.
+    // Atualizada ponto a ponto quando um override muda, como o _effCache.
+    var _soa = null;
+    function soa() {{
+      if (_soa === null) {{
+        var exps = PAYLOAD.expenses;
+        var n = exps.length;
+        var o = {{
+          dates: new Array(n),
+          ym: new Array(n),
+          titles: new Array(n),
+          amounts: new Float64Array(n),
+          categories: new Array(n),
+          counts: new Uint8Array(n),
+          // Variantes pré-minusculizadas/stringificadas para a busca: evita
+          // 3N alocações de string a cada tecla digitada
+          titlesLc: new Array(n),
+          categoriesLc: new Array(n),
+          amountStr: new Array(n)
+        }};
+        for (var i = 0; i < n; i++) {{
+          var e = exps[i];
+          var cat = getRowCategory(i);
+          o.dates[i] = e.date;
+          o.ym[i] = e.ym;
+          o.titles[i] = e.title;
+          o.amounts[i] = e.amount;
+          o.categories[i] = cat;
+          o.counts[i] = getRowCount(i) ? 1 : 0;
+          o.titlesLc[i] = e.title.toLowerCase();
+          o.categoriesLc[i] = cat ? cat.toLowerCase() : '';
+          o.amountStr[i] = String(e.amount);
+        }}
+        _soa = o;
+      }}
+      return _soa;
     }}
 
     function getRowCategory(idx) {{
@@ -688,57 +921,142 @@ def main():
       return (o && o.category !== undefined) ? o.category : (r.category || 'Outros');
     }}
 
+    // Índice reverso categoria → índices de linha: o filtro de categorias varre
+    // só as linhas selecionadas em vez do dataset inteiro. Invalidado quando um
+    // override muda a categoria de alguma linha (versão dos overrides).
+    var _catIndexCartao = {{ version: -1, idx: null }};
+    function categoryIndexCartao() {{
+      if (_catIndexCartao.version === overridesVersion) return _catIndexCartao.idx;
+      var idx = new Map();
+      for (var i = 0; i < PAYLOAD.expenses.length; i++) {{
+        var c = getRowCategory(i);
+        var arr = idx.get(c);
+        if (!arr) {{ arr = []; idx.set(c, arr); }}
+        arr.push(i);
+      }}
+      _catIndexCartao.version = overridesVersion;
+      _catIndexCartao.idx = idx;
+      return idx;
+    }}
+
     function getRowCount(idx) {{
       var o = overrides[idx];
       return (o && o.count !== undefined) ? o.count : true;
     }}
 
-    function aggregateByMonth(expenses) {{
-      var by = {{}};
-      expenses.forEach(function (r) {{
-        var m = r.date.slice(0, 7);
-        by[m] = (by[m] || 0) + r.amount;
-      }});
-      return Object.keys(by).sort().map(function (m) {{ return {{ month: m, total: Math.round(by[m] * 100) / 100 }}; }});
+    function monthsFromMap(by) {{
+      return Object.keys(by).sort().filter(function (m) {{ return by[m] > 0.005; }}).map(function (m) {{ return {{ month: m, total: Math.round(by[m] * 100) / 100 }}; }});
     }}
 
-    function aggregateByTitle(expenses) {{
-      var by = {{}};
-      expenses.forEach(function (r) {{ by[r.title] = (by[r.title] || 0) + r.amount; }});
-      var arr = Object.keys(by).map(function (k) {{ return {{ title: k, total: Math.round(by[k] * 100) / 100 }}; }});
+    function titlesFromMap(by) {{
+      var arr = Object.keys(by).filter(function (k) {{ return by[k] > 0.005; }}).map(function (k) {{ return {{ title: k, total: Math.round(by[k] * 100) / 100 }}; }});
       arr.sort(function (a, b) {{ return b.total - a.total; }});
       var total = arr.reduce(function (s, x) {{ return s + x.total; }}, 0);
       var cum = 0;
-      return arr.map(function (x) {{
+      arr.forEach(function (x) {{
         cum += x.total;
         var pct = total > 0 ? (cum / total) * 100 : 0;
-        var cls = pct <= 80 ? 'A' : (pct <= 95 ? 'B' : 'C');
-        return {{ title: x.title, total: x.total, cum_pct: Math.round(pct * 10) / 10, abc: cls }};
+        x.cum_pct = Math.round(pct * 10) / 10;
+        x.abc = pct <= 80 ? 'A' : (pct <= 95 ? 'B' : 'C');
       }});
+      return arr;
     }}
 
-    function aggregateByCategory(expenses) {{
-      var by = {{}};
-      expenses.forEach(function (r) {{ by[r.category] = (by[r.category] || 0) + r.amount; }});
-      var arr = Object.keys(by).map(function (k) {{ return {{ category: k, total: Math.round(by[k] * 100) / 100 }}; }});
+    function categoriesFromMap(by) {{
+      var arr = Object.keys(by).filter(function (k) {{ return by[k] > 0.005; }}).map(function (k) {{ return {{ category: k, total: Math.round(by[k] * 100) / 100 }}; }});
       arr.sort(function (a, b) {{ return b.total - a.total; }});
       return arr;
     }}
 
+    function aggregateMaps(expenses) {{
+      var agg = {{ total: 0, count: 0, by_month: {{}}, by_title: {{}}, by_category: {{}} }};
+      // Meses num buffer contíguo indexado por número (1–12): soma numérica
+      // pura no loop quente, sem hashing de chave string por linha
+      var mta = new Float64Array(13);
+      expenses.forEach(function (r) {{
+        agg.total += r.amount;
+        agg.count += 1;
+        mta[r.mm] += r.amount;
+        agg.by_title[r.title] = (agg.by_title[r.title] || 0) + r.amount;
+        agg.by_category[r.category] = (agg.by_category[r.category] || 0) + r.amount;
+      }});
+      var yr = PAYLOAD.year || 2025;
+      for (var mm = 1; mm <= 12; mm++) {{
+        if (mta[mm]) agg.by_month[yr + '-' + (mm < 10 ? '0' : '') + mm] = mta[mm];
+      }}
+      return agg;
+    }}
+
+    // Caminho comum (sem filtro de categoria): parte dos agregados pré-computados no
+    // Python e aplica só o delta das linhas com override — O(|overrides|), não O(N).
+    function applyOverrideDeltas() {{
+      var pre = PAYLOAD.precomputed;
+      var agg = {{
+        total: pre.total,
+        count: pre.count,
+        by_month: Object.assign({{}}, pre.by_month),
+        by_title: Object.assign({{}}, pre.by_title),
+        by_category: Object.assign({{}}, pre.by_category)
+      }};
+      Object.keys(overrides).forEach(function (k) {{
+        var i = parseInt(k, 10);
+        var r = PAYLOAD.expenses[i];
+        if (!r) return;
+        var o = overrides[i] || {{}};
+        var baseCat = r.category || 'Outros';
+        var cat = (o.category !== undefined) ? o.category : baseCat;
+        var counted = (o.count !== undefined) ? o.count : true;
+        var m = r.ym;
+        if (!counted) {{
+          agg.total -= r.amount;
+          agg.count -= 1;
+          agg.by_month[m] = (agg.by_month[m] || 0) - r.amount;
+          agg.by_title[r.title] = (agg.by_title[r.title] || 0) - r.amount;
+          agg.by_category[baseCat] = (agg.by_category[baseCat] || 0) - r.amount;
+        }} else if (cat !== baseCat) {{
+          agg.by_category[baseCat] = (agg.by_category[baseCat] || 0) - r.amount;
+          agg.by_category[cat] = (agg.by_category[cat] || 0) + r.amount;
+        }}
+      }});
+      return agg;
+    }}
+
     function recalc() {{
-      var eff = getEffectiveExpenses();
-      if (filterCategoriesCartao.length) eff = eff.filter(function (r) {{ return filterCategoriesCartao.indexOf(r.category) >= 0; }});
-      var total = eff.reduce(function (s, r) {{ return s + r.amount; }}, 0);
-      var by_month = aggregateByMonth(eff);
-      var by_title = aggregateByTitle(eff);
-      var by_category = aggregateByCategory(eff);
+      var cacheKey = overridesVersion + '|' + filterCategoriesCartao.join(',');
+      var hit = _recalcCache.get(cacheKey);
+      if (hit) return hit;
+      var agg;
+      if (!filterCategoriesCartao.length && PAYLOAD.precomputed) {{
+        agg = applyOverrideDeltas();
+      }} else {{
+        var eff;
+        if (filterCategoriesCartao.length) {{
+          var catIdx = categoryIndexCartao();
+          var picked = [];
+          filterCategoriesCartao.forEach(function (c) {{ var arr = catIdx.get(c); if (arr) picked = picked.concat(arr); }});
+          picked.sort(function (a, b) {{ return a - b; }});
+          eff = [];
+          picked.forEach(function (i) {{
+            if (!getRowCount(i)) return;
+            var r = PAYLOAD.expenses[i];
+            eff.push({{ date: r.date, ym: r.ym, mm: r.mm, title: r.title, amount: r.amount, category: getRowCategory(i), _count: true, _idx: i }});
+          }});
+        }} else {{
+          eff = getEffectiveExpenses();
+        }}
+        agg = aggregateMaps(eff);
+      }}
+      var by_month = monthsFromMap(agg.by_month);
+      var by_title = titlesFromMap(agg.by_title);
+      var by_category = categoriesFromMap(agg.by_category);
       var monthsCount = by_month.length || 1;
+      var total = Math.round(agg.total * 100) / 100;
       var over_budget_months = by_month.filter(function (m) {{ return m.total > budget; }}).map(function (m) {{
         return {{ month: m.month, total: m.total, over_amount: Math.round((m.total - budget) * 100) / 100 }};
       }});
-      return {{
-        total: Math.round(total * 100) / 100,
-        count: eff.length,
+      var res = {{
+        total: total,
+        count: agg.count,
         avg_monthly: Math.round((total / monthsCount) * 100) / 100,
         avg_weekly: Math.round((total / 52) * 100) / 100,
         by_month: by_month,
@@ -746,64 +1064,133 @@ def main():
         by_category: by_category,
         over_budget_months: over_budget_months
       }};
+      _recalcCache.set(cacheKey, res);
+      return res;
     }}
 
+    // Com a página oculta não há o que pintar: marca a aba como suja e aplica o
+    // render consolidado uma única vez quando ela volta a ficar visível
+    var _dirty = {{ all: false, conta: false, consol: false }};
+    function flushRenders() {{
+      if (_dirty.all) {{ _dirty.all = false; renderAll(); }}
+      if (_dirty.conta) {{ _dirty.conta = false; renderContaTab(); }}
+      if (_dirty.consol) {{ _dirty.consol = false; renderConsolidadoTab(); }}
+    }}
+    function schedule(tab) {{
+      _dirty[tab] = true;
+      if (document.hidden) return;
+      flushRenders();
+    }}
+    document.addEventListener('visibilitychange', function () {{ if (!document.hidden) flushRenders(); }});
+
+    // Lotes de leitura/escrita de DOM (estilo fastdom): leituras rodam antes,
+    // escritas acumulam e são aplicadas juntas num único requestAnimationFrame,
+    // evitando layout síncrono entre uma escrita e a leitura seguinte.
+    var _domReads = [], _domWrites = [], _domFlushScheduled = false;
+    function batchRead(f) {{ _domReads.push(f); scheduleDomFlush(); }}
+    function batchWrite(f) {{ _domWrites.push(f); scheduleDomFlush(); }}
+    function scheduleDomFlush() {{
+      if (_domFlushScheduled) return;
+      _domFlushScheduled = true;
+      requestAnimationFrame(function () {{
+        _domFlushScheduled = false;
+        var reads = _domReads;
+        _domReads = [];
+        for (var i = 0; i < reads.length; i++) reads[i]();
+        var writes = _domWrites;
+        _domWrites = [];
+        for (var j = 0; j < writes.length; j++) writes[j]();
+      }});
+    }}
+
+    // Referências de DOM resolvidas uma única vez (o script roda no fim do
+    // <body>, então os elementos já existem); os renders consultam só o cache
+    var els = {{
+      tbody: document.getElementById('tbody'),
+      cartaoScroll: document.getElementById('expenses-table-scroll'),
+      rowTmpl: document.getElementById('row-tmpl').content.firstElementChild,
+      totalYear: document.getElementById('total-year'),
+      avgMonthly: document.getElementById('avg-monthly'),
+      avgWeekly: document.getElementById('avg-weekly'),
+      countYear: document.getElementById('count-year'),
+      monthBars: document.getElementById('month-bars'),
+      overBudgetList: document.getElementById('over-budget-list'),
+      byCategory: document.getElementById('by-category'),
+      abcGroups: document.getElementById('abc-groups'),
+      byTitle: document.getElementById('by-title'),
+      contaScroll: document.getElementById('conta-table-scroll'),
+      contaTbody: document.getElementById('conta-tbody'),
+      contaEntradas: document.getElementById('conta-entradas'),
+      contaSaidas: document.getElementById('conta-saidas'),
+      contaSaldo: document.getElementById('conta-saldo'),
+      contaCount: document.getElementById('conta-count'),
+      contaMonthBars: document.getElementById('conta-month-bars'),
+      contaByCategory: document.getElementById('conta-by-category'),
+      contaAbcGroups: document.getElementById('conta-abc-groups'),
+      contaByEntity: document.getElementById('conta-by-entity'),
+      dreReceitas: document.getElementById('dre-receitas'),
+      dreDespesas: document.getElementById('dre-despesas'),
+      dreResultado: document.getElementById('dre-resultado'),
+      consolidadoMonthBars: document.getElementById('consolidado-month-bars'),
+      consolidadoByCategory: document.getElementById('consolidado-by-category'),
+      dreTbody: document.getElementById('dre-print-tbody'),
+      dfcTheadRow: document.getElementById('dfc-print-thead-row'),
+      dfcTbody: document.getElementById('dfc-print-tbody'),
+      sortThs: document.querySelectorAll('#expenses-table th[data-sort]')
+    }};
+
     var DONUT_COLORS = ['#da3636', '#9e6a03', '#238636', '#58a6ff', '#a371f7'];
+    var DONUT_CIRC = 2 * Math.PI * 45;
 
     function renderDonut(containerId, legendId, top5, labelKey) {{
       var container = document.getElementById(containerId);
       var legendEl = document.getElementById(legendId);
-      container.innerHTML = '';
       legendEl.innerHTML = '';
-      if (!top5 || top5.length === 0) {{ container.style.background = '#21262d'; return; }}
+      if (!top5 || top5.length === 0) {{
+        container.innerHTML = '<svg viewBox="0 0 120 120"><circle cx="60" cy="60" r="45" fill="none" stroke="#21262d" stroke-width="15"></circle></svg>';
+        return;
+      }}
       var total = top5.reduce(function (s, x) {{ return s + x.total; }}, 0);
-      var segs = [];
+      // Fatias como arcos com stroke-dasharray: geometria SVG, sem rasterizar
+      // um conic-gradient a cada atualização
+      var circles = '';
       var cum = 0;
       top5.forEach(function (x, i) {{
-        var pct = total > 0 ? (x.total / total) * 100 : 0;
-        segs.push(DONUT_COLORS[i % DONUT_COLORS.length] + ' ' + cum + '% ' + (cum + pct) + '%');
-        cum += pct;
+        var frac = total > 0 ? x.total / total : 0;
+        circles += '<circle cx="60" cy="60" r="45" fill="none" stroke="' + DONUT_COLORS[i % DONUT_COLORS.length] + '" stroke-width="15" stroke-dasharray="' + (frac * DONUT_CIRC) + ' ' + DONUT_CIRC + '" stroke-dashoffset="' + (-cum * DONUT_CIRC) + '" transform="rotate(-90 60 60)"></circle>';
+        cum += frac;
       }});
-      container.style.background = 'conic-gradient(' + segs.join(', ') + ')';
-      var hole = document.createElement('div');
-      hole.className = 'donut-hole';
-      container.appendChild(hole);
+      container.innerHTML = '<svg viewBox="0 0 120 120">' + circles + '</svg>';
+      var legendFrag = document.createDocumentFragment();
       top5.forEach(function (x, i) {{
         var li = document.createElement('li');
         li.innerHTML = '<span class="dot" style="background:' + DONUT_COLORS[i % DONUT_COLORS.length] + '"></span><span class="label">' + escapeHtml(x[labelKey]) + '</span><span class="val">' + fmtMoney(x.total) + '</span>';
-        legendEl.appendChild(li);
+        legendFrag.appendChild(li);
       }});
+      legendEl.appendChild(legendFrag);
     }}
 
     function renderAll() {{
       var data = recalc();
 
-      document.getElementById('total-year').textContent = fmtMoney(data.total);
-      document.getElementById('avg-monthly').textContent = fmtMoney(data.avg_monthly);
-      document.getElementById('avg-weekly').textContent = fmtMoney(data.avg_weekly);
-      document.getElementById('count-year').textContent = data.count.toLocaleString('pt-BR');
+      els.totalYear.textContent = fmtMoney(data.total);
+      els.avgMonthly.textContent = fmtMoney(data.avg_monthly);
+      els.avgWeekly.textContent = fmtMoney(data.avg_weekly);
+      els.countYear.textContent = data.count.toLocaleString('pt-BR');
 
-      var barsEl = document.getElementById('month-bars');
-      barsEl.innerHTML = '';
+      var barsEl = els.monthBars;
       var maxVal = Math.max(budget, Math.max.apply(null, data.by_month.map(function (m) {{ return m.total; }})) || 1);
       var barMaxH = 160;
-      data.by_month.forEach(function (m) {{
+      // Uma string única + uma atribuição de innerHTML: evita N invocações do parser/reflow
+      barsEl.innerHTML = data.by_month.map(function (m) {{
         var pct = maxVal > 0 ? (m.total / maxVal) * 100 : 0;
         var h = (pct / 100) * barMaxH;
         var over = m.total > budget;
         var label = monthNames[m.month.slice(5, 7)] || m.month.slice(5, 7);
-        var col = document.createElement('div');
-        col.className = 'col';
-        col.innerHTML = '<span class="bar ' + (over ? 'over' : 'under') + '" style="height:' + Math.max(4, h) + 'px" title="' + fmtMoney(m.total) + (over ? ' (acima do teto)' : '') + '"></span><span class="label' + (over ? ' over' : '') + '">' + label + '</span>';
-        barsEl.appendChild(col);
-      }});
-      var refLine = document.createElement('div');
-      refLine.className = 'ref-line';
-      refLine.style.bottom = (24 + (budget / maxVal) * barMaxH) + 'px';
-      refLine.title = 'Teto R$ ' + budget.toLocaleString('pt-BR', {{ minimumFractionDigits: 2 }});
-      barsEl.appendChild(refLine);
+        return '<div class="col"><span class="bar ' + (over ? 'over' : 'under') + '" style="height:' + Math.max(4, h) + 'px" title="' + fmtMoney(m.total) + (over ? ' (acima do teto)' : '') + '"></span><span class="label' + (over ? ' over' : '') + '">' + label + '</span></div>';
+      }}).join('') + '<div class="ref-line" style="bottom:' + (24 + (budget / maxVal) * barMaxH) + 'px" title="Teto R$ ' + budget.toLocaleString('pt-BR', {{ minimumFractionDigits: 2 }}) + '"></div>';
 
-      var overList = document.getElementById('over-budget-list');
+      var overList = els.overBudgetList;
       overList.innerHTML = '';
       if (data.over_budget_months.length) {{
         var ul = document.createElement('ul');
@@ -820,21 +1207,25 @@ def main():
         overList.appendChild(p);
       }}
 
-      var byCatEl = document.getElementById('by-category');
+      var byCatEl = els.byCategory;
       byCatEl.innerHTML = '';
+      // Fragment: uma única inserção no DOM vivo, independente do nº de categorias
+      var byCatFrag = document.createDocumentFragment();
       data.by_category.forEach(function (c) {{
         var span = document.createElement('span');
         span.innerHTML = escapeHtml(c.category) + ' <strong>' + fmtMoney(c.total) + '</strong>';
-        byCatEl.appendChild(span);
+        byCatFrag.appendChild(span);
       }});
+      byCatEl.appendChild(byCatFrag);
 
       var top5Entity = data.by_title.slice(0, 5);
       var top5Cat = data.by_category.slice(0, 5);
       renderDonut('donut-entity', 'donut-entity-legend', top5Entity, 'title');
       renderDonut('donut-category', 'donut-category-legend', top5Cat, 'category');
 
-      var abcGroupsEl = document.getElementById('abc-groups');
+      var abcGroupsEl = els.abcGroups;
       abcGroupsEl.innerHTML = '';
+      var abcFrag = document.createDocumentFragment();
       var byClass = {{ A: [], B: [], C: [] }};
       data.by_title.forEach(function (r) {{ byClass[r.abc].push(r); }});
       ['A', 'B', 'C'].forEach(function (cls) {{
@@ -849,44 +1240,29 @@ def main():
         body.className = 'abc-group-body collapsed';
         var table = document.createElement('table');
         table.className = 'abc-table';
-        table.innerHTML = '<thead><tr><th>Estabelecimento</th><th>Total (R$)</th><th>% Acum.</th></tr></thead><tbody></tbody>';
-        var tbody = table.querySelector('tbody');
-        items.forEach(function (r) {{
-          var tr = document.createElement('tr');
-          tr.className = 'abc-' + r.abc;
-          tr.innerHTML = '<td>' + escapeHtml(r.title) + '</td><td class="amount">' + fmtMoney(r.total) + '</td><td>' + r.cum_pct + '%</td>';
-          tbody.appendChild(tr);
-        }});
+        table.innerHTML = '<thead><tr><th>Estabelecimento</th><th>Total (R$)</th><th>% Acum.</th></tr></thead><tbody>' + items.map(function (r) {{
+          return '<tr class="abc-' + r.abc + '"><td>' + escapeHtml(r.title) + '</td><td class="amount">' + fmtMoney(r.total) + '</td><td>' + r.cum_pct + '%</td></tr>';
+        }}).join('') + '</tbody>';
         body.appendChild(table);
         group.appendChild(header);
         group.appendChild(body);
-        header.addEventListener('click', function () {{
-          body.classList.toggle('collapsed');
-          header.querySelector('.toggle').textContent = 'Total: ' + fmtMoney(totalCls) + (body.classList.contains('collapsed') ? ' ▶' : ' ▼');
-        }});
-        abcGroupsEl.appendChild(group);
+        abcFrag.appendChild(group);
       }});
+      abcGroupsEl.appendChild(abcFrag);
 
-      var byTitleEl = document.getElementById('by-title');
+      var byTitleEl = els.byTitle;
       byTitleEl.innerHTML = '';
+      var byTitleFrag = document.createDocumentFragment();
       data.by_title.forEach(function (x) {{
         var li = document.createElement('li');
         li.innerHTML = '<span class="name">' + escapeHtml(x.title) + '</span><span class="val">' + fmtMoney(x.total) + '</span>';
-        byTitleEl.appendChild(li);
+        byTitleFrag.appendChild(li);
       }});
+      byTitleEl.appendChild(byTitleFrag);
 
       renderTable(data);
     }}
 
-    function getEffectiveContaTransactions() {{
-      if (!PAYLOAD_CONTA || !PAYLOAD_CONTA.transactions) return [];
-      return PAYLOAD_CONTA.transactions.map(function (t, i) {{
-        var o = overridesConta[i];
-        var cat = (o && o.category !== undefined) ? o.category : (t.category || 'Outros');
-        var count = (o && o.count !== undefined) ? o.count : true;
-        return {{ date: t.date, amount: t.amount, entity: t.entity, description: t.description, category: cat, type: t.type, _count: count, _idx: i }};
-      }}).filter(function (t) {{ return t._count; }});
-    }}
     function getRowCategoryConta(idx) {{
       var t = PAYLOAD_CONTA.transactions[idx];
       var o = overridesConta[idx];
@@ -897,75 +1273,244 @@ def main():
       return (o && o.count !== undefined) ? o.count : true;
     }}
 
+    var _contaEffCache = null;
+    function contaEffCache() {{
+      if (_contaEffCache === null) {{
+        _contaEffCache = ((PAYLOAD_CONTA && PAYLOAD_CONTA.transactions) || []).map(function (t, i) {{
+          return {{ date: t.date, ym: t.ym, amount: t.amount, entity: t.entity, category: getRowCategoryConta(i), _count: getRowCountConta(i), _idx: i }};
+        }});
+      }}
+      return _contaEffCache;
+    }}
+
+
+    // Virtualização da tabela da conta: só as linhas visíveis (mais uma folga)
+    // existem no DOM; espaçadores acima/abaixo preservam a altura total do scroll.
+    var _contaRows = [];
+    var CONTA_ROW_H = 41;
+    // O HTML das <option> é idêntico em todas as linhas (só muda qual está selecionada);
+    // monta uma vez e aplica a seleção depois via select.value
+    var _contaCatOpts = null;
+    function contaCatOpts() {{
+      if (_contaCatOpts === null) {{
+        _contaCatOpts = ((PAYLOAD_CONTA && PAYLOAD_CONTA.master_categories) || []).map(function (c) {{
+          var e = escapeHtml(c);
+          return '<option value="' + e + '">' + e + '</option>';
+        }}).join('');
+      }}
+      return _contaCatOpts;
+    }}
+    function renderContaWindow() {{
+      if (!PAYLOAD_CONTA) return;
+      var scroller = els.contaScroll;
+      var tbody = els.contaTbody;
+      if (!scroller || !tbody) return;
+      var catOpts = contaCatOpts();
+      var rows = _contaRows;
+      var viewH = scroller.clientHeight || 600;
+      var startIdx = Math.max(0, Math.floor((scroller.scrollTop || 0) / CONTA_ROW_H) - 10);
+      var endIdx = Math.min(rows.length, startIdx + Math.ceil(viewH / CONTA_ROW_H) + 20);
+      var topPad = startIdx * CONTA_ROW_H;
+      var bottomPad = Math.max(0, (rows.length - endIdx) * CONTA_ROW_H);
+      var html = topPad > 0 ? '<tr class="spacer" style="height:' + topPad + 'px"><td colspan="5"></td></tr>' : '';
+      html += rows.slice(startIdx, endIdx).map(function (r) {{
+        var amt = r.amount || 0;
+        return '<tr' + (r._count ? '' : ' class="hidden-row"') + '><td>' + (r.date || '') + '</td><td>' + escapeHtml(r.entity || '') + '</td><td><select data-idx="' + r._idx + '" class="conta-cat-select" data-val="' + escapeHtml(r.category) + '">' + catOpts + '</select></td><td class="amount" style="color:' + (amt >= 0 ? '#238636' : '#f85149') + '">' + fmtMoney(amt) + '</td><td><select data-idx="' + r._idx + '" class="conta-count-select"><option value="1"' + (r._count ? ' selected' : '') + '>Sim</option><option value="0"' + (!r._count ? ' selected' : '') + '>Não</option></select></td></tr>';
+      }}).join('');
+      if (bottomPad > 0) html += '<tr class="spacer" style="height:' + bottomPad + 'px"><td colspan="5"></td></tr>';
+      tbody.innerHTML = html;
+      tbody.querySelectorAll('.conta-cat-select').forEach(function (sel) {{ sel.value = sel.dataset.val; }});
+    }}
+
+    function computeContaAgg(catSet, contaPristine) {{
+      var pre = PAYLOAD_CONTA.precomputed;
+      var entradas_total, saidas_total, byMonth, by_entity, by_category, count;
+      if (contaPristine && pre) {{
+        // Estado sem edições/filtros: consome os agregados pré-computados no Python
+        entradas_total = pre.entradas_total || 0;
+        saidas_total = pre.saidas_total || 0;
+        byMonth = pre.by_month || [];
+        by_entity = pre.by_entity || [];
+        by_category = pre.by_category || [];
+        count = PAYLOAD_CONTA.count || (PAYLOAD_CONTA.transactions || []).length;
+      }} else {{
+        // Agregação colunar (SoA): arrays paralelos de amount/mês/índices, com
+        // override e filtro resolvidos por linha — sem materializar objetos
+        var cols = PAYLOAD_CONTA.transactions_cols;
+        var amt = cols.amount, mmCol = cols.mm, catCol = cols.cat_idx, entCol = cols.ent_idx;
+        var catDict = PAYLOAD_CONTA.cat_dict || [], entDict = PAYLOAD_CONTA.ent_dict || [];
+        entradas_total = 0;
+        saidas_total = 0;
+        count = 0;
+        var entTA = new Float64Array(13), saiTA = new Float64Array(13);
+        var byEntitySum = {{}}, byCatSum = {{}};
+        for (var i = 0; i < amt.length; i++) {{
+          var o = overridesConta[i];
+          if (o && o.count === false) continue;
+          var cat = (o && o.category !== undefined && o.category) ? o.category : catDict[catCol[i]];
+          if (catSet && !catSet.has(cat)) continue;
+          count += 1;
+          var a = amt[i];
+          if (a > 0) {{
+            entradas_total += a;
+            entTA[mmCol[i]] += a;
+          }} else if (a < 0) {{
+            var abs = -a;
+            saidas_total += abs;
+            saiTA[mmCol[i]] += abs;
+            var e = entDict[entCol[i]];
+            byEntitySum[e] = (byEntitySum[e] || 0) + abs;
+            byCatSum[cat] = (byCatSum[cat] || 0) + abs;
+          }}
+        }}
+        var yr = PAYLOAD_CONTA.year || 2025;
+        byMonth = [];
+        for (var mn = 1; mn <= 12; mn++) {{
+          if (!entTA[mn] && !saiTA[mn]) continue;
+          byMonth.push({{ month: yr + '-' + (mn < 10 ? '0' : '') + mn, entradas: Math.round(entTA[mn] * 100) / 100, saidas: Math.round(saiTA[mn] * 100) / 100, saldo: Math.round((entTA[mn] - saiTA[mn]) * 100) / 100 }});
+        }}
+        var byEntityArr = Object.keys(byEntitySum).map(function (k) {{ return {{ title: k, total: Math.round(byEntitySum[k] * 100) / 100 }}; }}).sort(function (a, b) {{ return b.total - a.total; }});
+        var totalSai = byEntityArr.reduce(function (s, x) {{ return s + x.total; }}, 0);
+        var cum = 0;
+        by_entity = byEntityArr.map(function (x) {{ cum += x.total; var pct = totalSai > 0 ? (cum / totalSai) * 100 : 0; var cls = pct <= 80 ? 'A' : (pct <= 95 ? 'B' : 'C'); return {{ title: x.title, total: x.total, cum_pct: Math.round(pct * 10) / 10, abc: cls }}; }});
+        by_category = Object.keys(byCatSum).map(function (k) {{ return {{ category: k, total: Math.round(byCatSum[k] * 100) / 100 }}; }}).sort(function (a, b) {{ return b.total - a.total; }});
+      }}
+      return {{ entradas_total: entradas_total, saidas_total: saidas_total, byMonth: byMonth, by_entity: by_entity, by_category: by_category, count: count }};
+    }}
+
+    // Etapa pura de agregação num Web Worker (criado de um Blob): o main thread
+    // fica só com a pintura. O worker recebe as colunas SoA uma vez no init e
+    // responde agregados prontos; um número de sequência por aba descarta
+    // respostas obsoletas quando o usuário muda filtros mais rápido que o worker.
+    var _aggWorker = null;
+    var _aggSeq = 0;
+    var _aggLatest = {{ conta: 0, consol: 0 }};
+    function aggWorker() {{
+      if (_aggWorker !== null) return _aggWorker;
+      if (typeof Worker === 'undefined' || typeof URL === 'undefined' || !URL.createObjectURL) {{
+        _aggWorker = false;
+        return _aggWorker;
+      }}
+      var src = [
+        "var C=null;",
+        "onmessage=function(e){{",
+        "  var d=e.data;",
+        "  if(d.type==='init'){{C=d;return;}}",
+        "  if(d.type!=='agg'||!C)return;",
+        "  var cols=C.cols,catDict=C.catDict,entDict=C.entDict,yr=C.year;",
+        "  var amt=cols.amount,mm=cols.mm,ci=cols.cat_idx,ei=cols.ent_idx;",
+        "  var ov=d.overrides||{{}};",
+        "  var catSet=null;",
+        "  if(d.cats&&d.cats.length){{catSet={{}};d.cats.forEach(function(c){{catSet[c]=1;}});}}",
+        "  var ent=0,sai=0,count=0;",
+        "  var eT=new Float64Array(13),sT=new Float64Array(13);",
+        "  var bE={{}},bC={{}};",
+        "  for(var i=0;i<amt.length;i++){{",
+        "    var o=ov[i];",
+        "    if(o&&o.count===false)continue;",
+        "    var cat=(o&&o.category!==undefined&&o.category)?o.category:catDict[ci[i]];",
+        "    if(catSet&&!catSet[cat])continue;",
+        "    count+=1;",
+        "    var a=amt[i];",
+        "    if(a>0){{ent+=a;eT[mm[i]]+=a;}}",
+        "    else if(a<0){{var ab=-a;sai+=ab;sT[mm[i]]+=ab;var en=entDict[ei[i]];bE[en]=(bE[en]||0)+ab;bC[cat]=(bC[cat]||0)+ab;}}",
+        "  }}",
+        "  var byMonth=[];",
+        "  for(var mn=1;mn<=12;mn++){{",
+        "    if(!eT[mn]&&!sT[mn])continue;",
+        "    byMonth.push({{month:yr+'-'+(mn<10?'0':'')+mn,entradas:Math.round(eT[mn]*100)/100,saidas:Math.round(sT[mn]*100)/100,saldo:Math.round((eT[mn]-sT[mn])*100)/100}});",
+        "  }}",
+        "  var bEArr=Object.keys(bE).map(function(k){{return{{title:k,total:Math.round(bE[k]*100)/100}};}}).sort(function(a,b){{return b.total-a.total;}});",
+        "  var tot=bEArr.reduce(function(s,x){{return s+x.total;}},0);",
+        "  var cum=0;",
+        "  var by_entity=bEArr.map(function(x){{cum+=x.total;var pct=tot>0?(cum/tot)*100:0;return{{title:x.title,total:x.total,cum_pct:Math.round(pct*10)/10,abc:pct<=80?'A':(pct<=95?'B':'C')}};}});",
+        "  var by_category=Object.keys(bC).map(function(k){{return{{category:k,total:Math.round(bC[k]*100)/100}};}}).sort(function(a,b){{return b.total-a.total;}});",
+        "  postMessage({{seq:d.seq,key:d.key,tab:d.tab,agg:{{entradas_total:ent,saidas_total:sai,byMonth:byMonth,by_entity:by_entity,by_category:by_category,count:count}}}});",
+        "}};"
+      ].join('\\n');
+      try {{
+        _aggWorker = new Worker(URL.createObjectURL(new Blob([src], {{ type: 'text/javascript' }})));
+      }} catch (e) {{
+        _aggWorker = false;
+        return _aggWorker;
+      }}
+      _aggWorker.postMessage({{ type: 'init', cols: PAYLOAD_CONTA.transactions_cols, catDict: PAYLOAD_CONTA.cat_dict || [], entDict: PAYLOAD_CONTA.ent_dict || [], year: PAYLOAD_CONTA.year || 2025 }});
+      _aggWorker.onmessage = function (e) {{
+        var d = e.data;
+        if (d.seq !== _aggLatest[d.tab]) return;
+        _contaAggCache.set(d.key, d.agg);
+        schedule(d.tab);
+      }};
+      _aggWorker.onerror = function () {{
+        // Worker indisponível (ex.: CSP): volta para o caminho síncrono
+        _aggWorker = false;
+        schedule('conta');
+        schedule('consol');
+      }};
+      return _aggWorker;
+    }}
+    function requestContaAgg(key, cats, tab) {{
+      var w = aggWorker();
+      if (!w) return false;
+      _aggLatest[tab] = ++_aggSeq;
+      w.postMessage({{ type: 'agg', seq: _aggLatest[tab], key: key, tab: tab, overrides: overridesConta, cats: cats }});
+      return true;
+    }}
+
     function renderContaTab() {{
       if (!PAYLOAD_CONTA) {{
         var pane = document.getElementById('tab-conta');
         if (pane) pane.innerHTML = '<p class="notice">Execute <code>python scripts/consolidate_conta_corrente.py</code> e gere o dashboard novamente para ver os dados da conta corrente.</p>';
         return;
       }}
-      var eff = getEffectiveContaTransactions();
-      if (filterCategoriesConta.length) eff = eff.filter(function (t) {{ return filterCategoriesConta.indexOf(t.category) >= 0; }});
-      var entradas_total = eff.filter(function (t) {{ return t.amount > 0; }}).reduce(function (s, t) {{ return s + t.amount; }}, 0);
-      var saidas_total = eff.filter(function (t) {{ return t.amount < 0; }}).reduce(function (s, t) {{ return s + Math.abs(t.amount); }}, 0);
+      var contaPristine = !Object.keys(overridesConta).length && !filterCategoriesConta.length;
+      var aggKey = overridesContaVersion + '|' + filterCategoriesConta.join(',');
+      var agg = _contaAggCache.get(aggKey);
+      if (!agg) {{
+        // Estado editado/filtrado: agrega no worker e repinta quando responder
+        if (!contaPristine && requestContaAgg(aggKey, filterCategoriesConta, 'conta')) return;
+        agg = computeContaAgg(filterSetConta, contaPristine);
+        _contaAggCache.set(aggKey, agg);
+      }}
+      var entradas_total = agg.entradas_total, saidas_total = agg.saidas_total;
+      var byMonth = agg.byMonth, by_entity = agg.by_entity, by_category = agg.by_category;
       var saldo = Math.round((entradas_total - saidas_total) * 100) / 100;
-      document.getElementById('conta-entradas').textContent = fmtMoney(entradas_total);
-      document.getElementById('conta-saidas').textContent = fmtMoney(saidas_total);
-      document.getElementById('conta-saldo').textContent = fmtMoney(saldo);
-      document.getElementById('conta-saldo').style.color = saldo >= 0 ? '#238636' : '#f85149';
-      document.getElementById('conta-count').textContent = eff.length.toLocaleString('pt-BR');
-
-      var byMonthEnt = {{}}, byMonthSai = {{}};
-      eff.forEach(function (t) {{
-        var m = (t.date || '').slice(0, 7);
-        if (!m) return;
-        if (t.amount > 0) byMonthEnt[m] = (byMonthEnt[m] || 0) + t.amount;
-        else byMonthSai[m] = (byMonthSai[m] || 0) + Math.abs(t.amount);
-      }});
-      var months = Object.keys({{ ...byMonthEnt, ...byMonthSai }}).sort();
-      var byMonth = months.map(function (m) {{ return {{ month: m, entradas: Math.round((byMonthEnt[m] || 0) * 100) / 100, saidas: Math.round((byMonthSai[m] || 0) * 100) / 100, saldo: Math.round(((byMonthEnt[m] || 0) - (byMonthSai[m] || 0)) * 100) / 100 }}; }});
+      els.contaEntradas.textContent = fmtMoney(entradas_total);
+      els.contaSaidas.textContent = fmtMoney(saidas_total);
+      els.contaSaldo.textContent = fmtMoney(saldo);
+      els.contaSaldo.style.color = saldo >= 0 ? '#238636' : '#f85149';
+      els.contaCount.textContent = agg.count.toLocaleString('pt-BR');
 
-      var barsEl = document.getElementById('conta-month-bars');
-      barsEl.innerHTML = '';
+      var barsEl = els.contaMonthBars;
       var maxVal = 1;
       byMonth.forEach(function (m) {{ maxVal = Math.max(maxVal, m.entradas || 0, m.saidas || 0); }});
       var barMaxH = 160;
-      byMonth.forEach(function (m) {{
+      barsEl.innerHTML = byMonth.map(function (m) {{
         var hEnt = maxVal > 0 ? ((m.entradas || 0) / maxVal) * barMaxH : 0;
         var hSai = maxVal > 0 ? ((m.saidas || 0) / maxVal) * barMaxH : 0;
         var label = monthNames[m.month.slice(5, 7)] || m.month.slice(5, 7);
-        var col = document.createElement('div');
-        col.className = 'col';
-        col.innerHTML = '<span class="bar under" style="height:' + Math.max(4, hEnt) + 'px; margin-bottom:2px;" title="Entradas ' + fmtMoney(m.entradas) + '"></span><span class="bar over" style="height:' + Math.max(4, hSai) + 'px" title="Saídas ' + fmtMoney(m.saidas) + '"></span><span class="label">' + label + '</span>';
-        barsEl.appendChild(col);
-      }});
-
-      var saidas = eff.filter(function (t) {{ return t.amount < 0; }});
-      var byEntitySum = {{}};
-      saidas.forEach(function (t) {{ var e = t.entity || 'Outros'; byEntitySum[e] = (byEntitySum[e] || 0) + Math.abs(t.amount); }});
-      var byEntityArr = Object.keys(byEntitySum).map(function (k) {{ return {{ title: k, total: Math.round(byEntitySum[k] * 100) / 100 }}; }}).sort(function (a, b) {{ return b.total - a.total; }});
-      var totalSai = byEntityArr.reduce(function (s, x) {{ return s + x.total; }}, 0);
-      var cum = 0;
-      var by_entity = byEntityArr.map(function (x) {{ cum += x.total; var pct = totalSai > 0 ? (cum / totalSai) * 100 : 0; var cls = pct <= 80 ? 'A' : (pct <= 95 ? 'B' : 'C'); return {{ title: x.title, total: x.total, cum_pct: Math.round(pct * 10) / 10, abc: cls }}; }});
-
-      var byCatSum = {{}};
-      saidas.forEach(function (t) {{ var c = t.category || 'Outros'; byCatSum[c] = (byCatSum[c] || 0) + Math.abs(t.amount); }});
-      var by_category = Object.keys(byCatSum).map(function (k) {{ return {{ category: k, total: Math.round(byCatSum[k] * 100) / 100 }}; }}).sort(function (a, b) {{ return b.total - a.total; }});
+        return '<div class="col"><span class="bar under" style="height:' + Math.max(4, hEnt) + 'px; margin-bottom:2px;" title="Entradas ' + fmtMoney(m.entradas) + '"></span><span class="bar over" style="height:' + Math.max(4, hSai) + 'px" title="Saídas ' + fmtMoney(m.saidas) + '"></span><span class="label">' + label + '</span></div>';
+      }}).join('');
 
-      var byCatEl = document.getElementById('conta-by-category');
+      var byCatEl = els.contaByCategory;
       byCatEl.innerHTML = '';
+      var byCatFrag = document.createDocumentFragment();
       by_category.forEach(function (x) {{
         var span = document.createElement('span');
         span.innerHTML = escapeHtml(x.category) + ' <strong>' + fmtMoney(x.total) + '</strong>';
-        byCatEl.appendChild(span);
+        byCatFrag.appendChild(span);
       }});
+      byCatEl.appendChild(byCatFrag);
 
-      var top5Entity = by_entity.slice(0, 5);
-      var top5Cat = by_category.slice(0, 5);
+      // Sem edições/filtros, o Top-5 pré-computado no Python já serve direto
+      var top5Entity = (contaPristine && PAYLOAD_CONTA.top_entities) ? PAYLOAD_CONTA.top_entities : by_entity.slice(0, 5);
+      var top5Cat = (contaPristine && PAYLOAD_CONTA.top_categories) ? PAYLOAD_CONTA.top_categories : by_category.slice(0, 5);
       renderDonut('conta-donut-entity', 'conta-donut-entity-legend', top5Entity, 'title');
       renderDonut('conta-donut-category', 'conta-donut-category-legend', top5Cat, 'category');
 
-      var abcEl = document.getElementById('conta-abc-groups');
+      var abcEl = els.contaAbcGroups;
       abcEl.innerHTML = '';
+      var abcFrag = document.createDocumentFragment();
       var byClass = {{ A: [], B: [], C: [] }};
       by_entity.forEach(function (r) {{ byClass[r.abc].push(r); }});
       ['A', 'B', 'C'].forEach(function (cls) {{
@@ -980,38 +1525,32 @@ def main():
         body.className = 'abc-group-body collapsed';
         var table = document.createElement('table');
         table.className = 'abc-table';
-        table.innerHTML = '<thead><tr><th>Entidade</th><th>Total (R$)</th><th>% Acum.</th></tr></thead><tbody></tbody>';
-        var tbody = table.querySelector('tbody');
-        items.forEach(function (r) {{
-          var tr = document.createElement('tr');
-          tr.className = 'abc-' + r.abc;
-          tr.innerHTML = '<td>' + escapeHtml(r.title) + '</td><td class="amount">' + fmtMoney(r.total) + '</td><td>' + r.cum_pct + '%</td>';
-          tbody.appendChild(tr);
-        }});
+        table.innerHTML = '<thead><tr><th>Entidade</th><th>Total (R$)</th><th>% Acum.</th></tr></thead><tbody>' + items.map(function (r) {{
+          return '<tr class="abc-' + r.abc + '"><td>' + escapeHtml(r.title) + '</td><td class="amount">' + fmtMoney(r.total) + '</td><td>' + r.cum_pct + '%</td></tr>';
+        }}).join('') + '</tbody>';
         body.appendChild(table);
         group.appendChild(header);
         group.appendChild(body);
-        header.addEventListener('click', function () {{
-          body.classList.toggle('collapsed');
-          header.querySelector('.toggle').textContent = 'Total: ' + fmtMoney(totalCls) + (body.classList.contains('collapsed') ? ' ▶' : ' ▼');
-        }});
-        abcEl.appendChild(group);
+        abcFrag.appendChild(group);
       }});
+      abcEl.appendChild(abcFrag);
 
-      var byEntityEl = document.getElementById('conta-by-entity');
+      var byEntityEl = els.contaByEntity;
       byEntityEl.innerHTML = '';
+      var byEntityFrag = document.createDocumentFragment();
       by_entity.forEach(function (x) {{
         var li = document.createElement('li');
         li.innerHTML = '<span class="name">' + escapeHtml(x.title) + '</span><span class="val">' + fmtMoney(x.total) + '</span>';
-        byEntityEl.appendChild(li);
+        byEntityFrag.appendChild(li);
       }});
+      byEntityEl.appendChild(byEntityFrag);
 
       var txn = PAYLOAD_CONTA.transactions || [];
       var masterCats = PAYLOAD_CONTA.master_categories || [];
       var filterMonthSel = document.getElementById('conta-filter-month');
       filterMonthSel.innerHTML = '<option value="">Todos</option>';
       var monthsSeen = {{}};
-      txn.forEach(function (t) {{ monthsSeen[(t.date || '').slice(0, 7)] = true; }});
+      txn.forEach(function (t) {{ monthsSeen[t.ym || ''] = true; }});
       Object.keys(monthsSeen).sort().forEach(function (m) {{
         var opt = document.createElement('option');
         opt.value = m;
@@ -1040,58 +1579,67 @@ def main():
         window._contaCategoriesMultiBound = true;
         filterCategoriesContaEl.addEventListener('change', function () {{
           filterCategoriesConta = Array.from(this.selectedOptions).map(function (o) {{ return o.value; }}).filter(Boolean);
-          renderContaTab();
+          filterSetConta = filterCategoriesConta.length ? new Set(filterCategoriesConta) : null;
+          schedule('conta');
         }});
       }}
       var contaSearchTerm = '';
       var contaFilterMonth = '';
       var contaFilterCat = '';
       function renderContaTable() {{
-        var rows = txn.map(function (t, i) {{ return {{ date: t.date, amount: t.amount, entity: t.entity, category: getRowCategoryConta(i), _count: getRowCountConta(i), _idx: i }}; }});
+        // O consolidador já grava as transações ordenadas por (data, valor);
+        // map/filter preservam a ordem, então não há o que reordenar aqui
+        var rows = contaEffCache();
         if (contaSearchTerm) {{
           var q = contaSearchTerm.toLowerCase();
           rows = rows.filter(function (r) {{
             return (r.date && r.date.toString().toLowerCase().includes(q)) || (r.entity && r.entity.toLowerCase().includes(q)) || (r.category && r.category.toLowerCase().includes(q)) || (r.amount && r.amount.toString().includes(q));
           }});
         }}
-        if (contaFilterMonth) rows = rows.filter(function (r) {{ return r.date && r.date.slice(0, 7) === contaFilterMonth; }});
+        if (contaFilterMonth) rows = rows.filter(function (r) {{ return r.ym === contaFilterMonth; }});
         if (contaFilterCat) rows = rows.filter(function (r) {{ return r.category === contaFilterCat; }});
-        rows.sort(function (a, b) {{ return (a.date || '').localeCompare(b.date || '') || ((a.amount || 0) - (b.amount || 0)); }});
-        var tbody = document.getElementById('conta-tbody');
-        tbody.innerHTML = '';
-        rows.forEach(function (r) {{
-          var tr = document.createElement('tr');
-          if (!r._count) tr.classList.add('hidden-row');
-          var amt = r.amount || 0;
-          var catOpts = masterCats.map(function (c) {{ return '<option value="' + escapeHtml(c) + '"' + (c === r.category ? ' selected' : '') + '>' + escapeHtml(c) + '</option>'; }}).join('');
-          var catSelect = '<select data-idx="' + r._idx + '" class="conta-cat-select">' + catOpts + '</select>';
-          var countSelect = '<select data-idx="' + r._idx + '" class="conta-count-select"><option value="1"' + (r._count ? ' selected' : '') + '>Sim</option><option value="0"' + (!r._count ? ' selected' : '') + '>Não</option></select>';
-          tr.innerHTML = '<td>' + (r.date || '') + '</td><td>' + escapeHtml(r.entity || '') + '</td><td>' + catSelect + '</td><td class="amount" style="color:' + (amt >= 0 ? '#238636' : '#f85149') + '">' + fmtMoney(amt) + '</td><td>' + countSelect + '</td>';
-          tbody.appendChild(tr);
+        _contaRows = rows;
+        renderContaWindow();
+      }}
+      if (!window._contaScrollBound) {{
+        window._contaScrollBound = true;
+        var _contaScrollRAF = 0;
+        els.contaScroll.addEventListener('scroll', function () {{
+          if (_contaScrollRAF) return;
+          _contaScrollRAF = requestAnimationFrame(function () {{ _contaScrollRAF = 0; renderContaWindow(); }});
         }});
-        tbody.querySelectorAll('.conta-cat-select').forEach(function (sel) {{
-          sel.addEventListener('change', function () {{
-            var idx = parseInt(sel.getAttribute('data-idx'), 10);
+      }}
+      if (!window._contaTbodyDelegated) {{
+        window._contaTbodyDelegated = true;
+        els.contaTbody.addEventListener('change', function (e) {{
+          var sel = e.target;
+          var idx = parseInt(sel.getAttribute('data-idx'), 10);
+          if (isNaN(idx)) return;
+          if (sel.classList.contains('conta-cat-select')) {{
             overridesConta[idx] = overridesConta[idx] || {{}};
             overridesConta[idx].category = sel.value;
-            saveOverridesConta();
-            renderContaTab();
-          }});
-        }});
-        tbody.querySelectorAll('.conta-count-select').forEach(function (sel) {{
-          sel.addEventListener('change', function () {{
-            var idx = parseInt(sel.getAttribute('data-idx'), 10);
+            if (_contaEffCache) _contaEffCache[idx].category = sel.value;
+          }} else if (sel.classList.contains('conta-count-select')) {{
             overridesConta[idx] = overridesConta[idx] || {{}};
             overridesConta[idx].count = sel.value === '1';
-            saveOverridesConta();
-            renderContaTab();
-          }});
+            if (_contaEffCache) _contaEffCache[idx]._count = overridesConta[idx].count;
+          }} else {{
+            return;
+          }}
+          saveOverridesConta();
+          schedule('conta');
         }});
       }}
       renderContaTable();
       if (!window._contaFiltersBound) {{
         window._contaFiltersBound = true;
-        document.getElementById('conta-search').addEventListener('input', function () {{ contaSearchTerm = this.value.trim(); renderContaTable(); }});
+        var _contaSearchRAF = 0;
+        document.getElementById('conta-search').addEventListener('input', function () {{
+          contaSearchTerm = this.value.trim();
+          // Coalesce rajadas de digitação em no máximo um rebuild por frame
+          if (_contaSearchRAF) return;
+          _contaSearchRAF = requestAnimationFrame(function () {{ _contaSearchRAF = 0; renderContaTable(); }});
+        }});
         filterMonthSel.addEventListener('change', function () {{ contaFilterMonth = this.value; renderContaTable(); }});
         filterCatSel.addEventListener('change', function () {{ contaFilterCat = this.value; renderContaTable(); }});
       }}
@@ -1100,33 +1648,42 @@ def main():
     function renderConsolidadoTab() {{
       var co = PAYLOAD_CONSOLIDADO;
       if (!co) return;
-      var eff = typeof getEffectiveContaTransactions === 'function' ? getEffectiveContaTransactions() : [];
-      if (filterCategoriesConsolidado.length) eff = eff.filter(function (t) {{ return filterCategoriesConsolidado.indexOf(t.category) >= 0; }});
-      var receitas = eff.filter(function (t) {{ return t.amount > 0; }}).reduce(function (s, t) {{ return s + t.amount; }}, 0);
-      var despesas = eff.filter(function (t) {{ return t.amount < 0; }}).reduce(function (s, t) {{ return s + Math.abs(t.amount); }}, 0);
-      var resultado = Math.round((receitas - despesas) * 100) / 100;
-      document.getElementById('dre-receitas').textContent = fmtMoney(receitas);
-      document.getElementById('dre-despesas').textContent = fmtMoney(despesas);
-      var resEl = document.getElementById('dre-resultado');
-      resEl.textContent = fmtMoney(resultado);
-      resEl.style.color = resultado >= 0 ? '#238636' : '#f85149';
-
-      var byMonthEnt = {{}}, byMonthSai = {{}};
-      eff.forEach(function (t) {{
-        var m = (t.date || '').slice(0, 7);
-        if (!m) return;
-        if (t.amount > 0) byMonthEnt[m] = (byMonthEnt[m] || 0) + t.amount;
-        else byMonthSai[m] = (byMonthSai[m] || 0) + Math.abs(t.amount);
-      }});
-      var months = Object.keys({{ ...byMonthEnt, ...byMonthSai }}).sort();
-      var byMonth = months.map(function (m) {{ return {{ month: m, entradas: Math.round((byMonthEnt[m] || 0) * 100) / 100, saidas: Math.round((byMonthSai[m] || 0) * 100) / 100, saldo: Math.round(((byMonthEnt[m] || 0) - (byMonthSai[m] || 0)) * 100) / 100 }}; }});
+      // Mesma agregação (e mesmo cache LRU) da aba conta: a chave é a versão
+      // dos overrides + filtro, então os dois tabs compartilham os resultados
+      var agg;
+      if (PAYLOAD_CONTA) {{
+        var consolPristine = !Object.keys(overridesConta).length && !filterCategoriesConsolidado.length;
+        var aggKey = overridesContaVersion + '|' + filterCategoriesConsolidado.join(',');
+        agg = _contaAggCache.get(aggKey);
+        if (!agg) {{
+          if (!consolPristine && requestContaAgg(aggKey, filterCategoriesConsolidado, 'consol')) return;
+          agg = computeContaAgg(filterSetConsolidado, consolPristine);
+          _contaAggCache.set(aggKey, agg);
+        }}
+      }} else {{
+        agg = {{ entradas_total: 0, saidas_total: 0, byMonth: [], by_entity: [], by_category: [], count: 0 }};
+      }}
+      // Fase de leitura: todas as referências de DOM capturadas de uma vez,
+      // antes de qualquer mutação (leituras não intercalam com escritas)
+      var receitasEl = els.dreReceitas;
+      var despesasEl = els.dreDespesas;
+      var resEl = els.dreResultado;
+      var barsEl = els.consolidadoMonthBars;
+      var byCatEl = els.consolidadoByCategory;
+      var filterConsolidadoEl = document.getElementById('filter-categories-consolidado');
+      var dreTbody = els.dreTbody;
+      var dfcTheadRow = els.dfcTheadRow;
+      var dfcTbody = els.dfcTbody;
+      var btnPrint = document.getElementById('btn-print-dre-dfc');
 
-      var barsEl = document.getElementById('consolidado-month-bars');
-      barsEl.innerHTML = '';
-      var byMonthData = byMonth;
+      // Fase de cálculo: fragments montados fora da árvore viva
+      var receitas = agg.entradas_total, despesas = agg.saidas_total;
+      var byMonthData = agg.byMonth;
+      var resultado = Math.round((receitas - despesas) * 100) / 100;
       var maxAbs = 1;
       byMonthData.forEach(function (m) {{ maxAbs = Math.max(maxAbs, Math.abs(m.saldo || 0)); }});
       var barMaxH = 160;
+      var barsFrag = document.createDocumentFragment();
       byMonthData.forEach(function (m) {{
         var saldo = m.saldo || 0;
         var pct = maxAbs > 0 ? (Math.abs(saldo) / maxAbs) * 100 : 0;
@@ -1136,21 +1693,16 @@ def main():
         var col = document.createElement('div');
         col.className = 'col';
         col.innerHTML = '<span class="bar ' + (positive ? 'under' : 'over') + '" style="height:' + Math.max(4, h) + 'px" title="Saldo ' + fmtMoney(saldo) + '"></span><span class="label' + (positive ? '' : ' over') + '">' + label + '</span>';
-        barsEl.appendChild(col);
+        barsFrag.appendChild(col);
       }});
 
-      var byCatSum = {{}};
-      eff.filter(function (t) {{ return t.amount < 0; }}).forEach(function (t) {{ var c = t.category || 'Outros'; byCatSum[c] = (byCatSum[c] || 0) + Math.abs(t.amount); }});
-      var by_category_conta = Object.keys(byCatSum).map(function (k) {{ return {{ category: k, total: Math.round(byCatSum[k] * 100) / 100 }}; }}).sort(function (a, b) {{ return b.total - a.total; }});
-      var byCatEl = document.getElementById('consolidado-by-category');
-      byCatEl.innerHTML = '';
-      by_category_conta.forEach(function (x) {{
+      var byCatFrag = document.createDocumentFragment();
+      agg.by_category.forEach(function (x) {{
         var span = document.createElement('span');
         span.innerHTML = escapeHtml(x.category) + ' <strong>' + fmtMoney(x.total) + '</strong>';
-        byCatEl.appendChild(span);
+        byCatFrag.appendChild(span);
       }});
 
-      var filterConsolidadoEl = document.getElementById('filter-categories-consolidado');
       if (filterConsolidadoEl && PAYLOAD_CONTA && PAYLOAD_CONTA.master_categories && !window._consolidadoCategoriesBound) {{
         window._consolidadoCategoriesBound = true;
         filterConsolidadoEl.innerHTML = '';
@@ -1162,62 +1714,60 @@ def main():
         }});
         filterConsolidadoEl.addEventListener('change', function () {{
           filterCategoriesConsolidado = Array.from(this.selectedOptions).map(function (o) {{ return o.value; }}).filter(Boolean);
-          renderConsolidadoTab();
+          filterSetConsolidado = filterCategoriesConsolidado.length ? new Set(filterCategoriesConsolidado) : null;
+          schedule('consol');
         }});
       }}
 
-      var dreTbody = document.getElementById('dre-print-tbody');
-      var dfcTheadRow = document.getElementById('dfc-print-thead-row');
-      var dfcTbody = document.getElementById('dfc-print-tbody');
+      // DRE/DFC como uma string por tabela: um único parse via innerHTML em
+      // vez de dezenas de createElement/appendChild por célula
+      var dreHtml = null;
       if (dreTbody) {{
-        dreTbody.innerHTML = '';
-        var despesasPorCat = {{}};
-        eff.filter(function (t) {{ return t.amount < 0; }}).forEach(function (t) {{ var c = t.category || 'Outros'; despesasPorCat[c] = (despesasPorCat[c] || 0) + Math.abs(t.amount); }});
-        var tr1 = document.createElement('tr');
-        tr1.innerHTML = '<td>Receitas</td><td class="amount">' + fmtMoney(receitas) + '</td>';
-        dreTbody.appendChild(tr1);
-        Object.keys(despesasPorCat).sort(function (a, b) {{ return despesasPorCat[b] - despesasPorCat[a]; }}).forEach(function (cat) {{
-          var tr = document.createElement('tr');
-          tr.innerHTML = '<td>Despesas — ' + escapeHtml(cat) + '</td><td class="amount">' + fmtMoney(Math.round(despesasPorCat[cat] * 100) / 100) + '</td>';
-          dreTbody.appendChild(tr);
+        var dreParts = ['<tr><td>Receitas</td><td class="amount">' + fmtMoney(receitas) + '</td></tr>'];
+        agg.by_category.forEach(function (c) {{
+          dreParts.push('<tr><td>Despesas — ' + escapeHtml(c.category) + '</td><td class="amount">' + fmtMoney(c.total) + '</td></tr>');
         }});
-        var trTotal = document.createElement('tr');
-        trTotal.className = 'total-row';
-        trTotal.innerHTML = '<td>Despesas (total)</td><td class="amount">' + fmtMoney(despesas) + '</td>';
-        dreTbody.appendChild(trTotal);
-        var trRes = document.createElement('tr');
-        trRes.className = 'total-row';
-        trRes.innerHTML = '<td>Resultado (DRE)</td><td class="amount">' + fmtMoney(resultado) + '</td>';
-        dreTbody.appendChild(trRes);
+        dreParts.push('<tr class="total-row"><td>Despesas (total)</td><td class="amount">' + fmtMoney(despesas) + '</td></tr>');
+        dreParts.push('<tr class="total-row"><td>Resultado (DRE)</td><td class="amount">' + fmtMoney(resultado) + '</td></tr>');
+        dreHtml = dreParts.join('');
       }}
+      var dfcHeadHtml = null, dfcBodyHtml = null;
       if (dfcTheadRow && dfcTbody) {{
-        dfcTheadRow.innerHTML = '<th>Descrição</th>';
-        byMonthData.forEach(function (m) {{ var th = document.createElement('th'); th.className = 'amount'; th.textContent = monthNames[m.month.slice(5, 7)] || m.month.slice(5, 7); dfcTheadRow.appendChild(th); }});
-        var thTotal = document.createElement('th');
-        thTotal.className = 'amount';
-        thTotal.textContent = 'Total';
-        dfcTheadRow.appendChild(thTotal);
-        dfcTbody.innerHTML = '';
-        var rowEnt = document.createElement('tr');
-        rowEnt.innerHTML = '<td>Entradas</td>';
-        var sumEnt = 0;
-        byMonthData.forEach(function (m) {{ var td = document.createElement('td'); td.className = 'amount'; td.textContent = fmtMoney(m.entradas); rowEnt.appendChild(td); sumEnt += m.entradas; }});
-        var tdEntTotal = document.createElement('td'); tdEntTotal.className = 'amount'; tdEntTotal.textContent = fmtMoney(Math.round(sumEnt * 100) / 100); rowEnt.appendChild(tdEntTotal);
-        dfcTbody.appendChild(rowEnt);
-        var rowSai = document.createElement('tr');
-        rowSai.innerHTML = '<td>Saídas</td>';
-        var sumSai = 0;
-        byMonthData.forEach(function (m) {{ var td = document.createElement('td'); td.className = 'amount'; td.textContent = fmtMoney(m.saidas); rowSai.appendChild(td); sumSai += m.saidas; }});
-        var tdSaiTotal = document.createElement('td'); tdSaiTotal.className = 'amount'; tdSaiTotal.textContent = fmtMoney(Math.round(sumSai * 100) / 100); rowSai.appendChild(tdSaiTotal);
-        dfcTbody.appendChild(rowSai);
-        var rowSaldo = document.createElement('tr');
-        rowSaldo.className = 'total-row';
-        rowSaldo.innerHTML = '<td>Saldo do mês</td>';
-        byMonthData.forEach(function (m) {{ var td = document.createElement('td'); td.className = 'amount'; td.textContent = fmtMoney(m.saldo); rowSaldo.appendChild(td); }});
-        var tdSaldoTotal = document.createElement('td'); tdSaldoTotal.className = 'amount'; tdSaldoTotal.textContent = fmtMoney(resultado); rowSaldo.appendChild(tdSaldoTotal);
-        dfcTbody.appendChild(rowSaldo);
+        var headParts = ['<th>Descrição</th>'];
+        byMonthData.forEach(function (m) {{ headParts.push('<th class="amount">' + (monthNames[m.month.slice(5, 7)] || m.month.slice(5, 7)) + '</th>'); }});
+        headParts.push('<th class="amount">Total</th>');
+        dfcHeadHtml = headParts.join('');
+        var sumEnt = 0, sumSai = 0;
+        var entParts = ['<tr><td>Entradas</td>'];
+        var saiParts = ['<tr><td>Saídas</td>'];
+        var saldoParts = ['<tr class="total-row"><td>Saldo do mês</td>'];
+        byMonthData.forEach(function (m) {{
+          sumEnt += m.entradas;
+          sumSai += m.saidas;
+          entParts.push('<td class="amount">' + fmtMoney(m.entradas) + '</td>');
+          saiParts.push('<td class="amount">' + fmtMoney(m.saidas) + '</td>');
+          saldoParts.push('<td class="amount">' + fmtMoney(m.saldo) + '</td>');
+        }});
+        entParts.push('<td class="amount">' + fmtMoney(Math.round(sumEnt * 100) / 100) + '</td></tr>');
+        saiParts.push('<td class="amount">' + fmtMoney(Math.round(sumSai * 100) / 100) + '</td></tr>');
+        saldoParts.push('<td class="amount">' + fmtMoney(resultado) + '</td></tr>');
+        dfcBodyHtml = entParts.join('') + saiParts.join('') + saldoParts.join('');
       }}
-      var btnPrint = document.getElementById('btn-print-dre-dfc');
+
+      // Fase de escrita: todas as mutações juntas, num único frame
+      batchWrite(function () {{
+        receitasEl.textContent = fmtMoney(receitas);
+        despesasEl.textContent = fmtMoney(despesas);
+        resEl.textContent = fmtMoney(resultado);
+        resEl.style.color = resultado >= 0 ? '#238636' : '#f85149';
+        barsEl.replaceChildren(barsFrag);
+        byCatEl.replaceChildren(byCatFrag);
+        if (dreHtml !== null) dreTbody.innerHTML = dreHtml;
+        if (dfcHeadHtml !== null) {{
+          dfcTheadRow.innerHTML = dfcHeadHtml;
+          dfcTbody.innerHTML = dfcBodyHtml;
+        }}
+      }});
       if (btnPrint && !window._btnPrintDreBound) {{
         window._btnPrintDreBound = true;
         btnPrint.addEventListener('click', function () {{ window.print(); }});
@@ -1232,55 +1782,123 @@ def main():
     var filterCategoriesCartao = [];
     var filterCategoriesConta = [];
     var filterCategoriesConsolidado = [];
+    // Sets paralelos construídos uma vez por mudança de filtro (lookup O(1))
+    var filterSetConta = null;
+    var filterSetConsolidado = null;
+
+    // Virtualização da tabela do cartão: mesma abordagem da conta — só a
+    // janela visível (mais folga) vira DOM; espaçadores mantêm a altura total.
+    var _cartaoRows = [];
+    var CARTAO_ROW_H = 41;
+    var _cartaoScrollRAF = 0;
+    function renderCartaoWindow() {{
+      var scroller = els.cartaoScroll;
+      var tbody = els.tbody;
+      if (!scroller || !tbody) return;
+      // Clona o <template> da linha e um <select> de categorias pré-montado:
+      // evita reparsear o mesmo HTML de opções para cada lançamento.
+      var rowProto = els.rowTmpl;
+      if (!_catSelProto) {{
+        _catSelProto = document.createElement('select');
+        _catSelProto.className = 'cat-select';
+        _catSelProto.innerHTML = allCategories.map(function (c) {{ return '<option value="' + escapeHtml(c) + '">' + escapeHtml(c) + '</option>'; }}).join('');
+      }}
+      var rows = _cartaoRows;
+      var viewH = scroller.clientHeight || 600;
+      var startIdx = Math.max(0, Math.floor((scroller.scrollTop || 0) / CARTAO_ROW_H) - 10);
+      var endIdx = Math.min(rows.length, startIdx + Math.ceil(viewH / CARTAO_ROW_H) + 20);
+      var topPad = startIdx * CARTAO_ROW_H;
+      var bottomPad = Math.max(0, (rows.length - endIdx) * CARTAO_ROW_H);
+      function spacer(h) {{
+        var tr = document.createElement('tr');
+        tr.className = 'spacer';
+        tr.style.height = h + 'px';
+        tr.innerHTML = '<td colspan="5"></td>';
+        return tr;
+      }}
+      var o = soa();
+      var frag = document.createDocumentFragment();
+      if (topPad > 0) frag.appendChild(spacer(topPad));
+      for (var i = startIdx; i < endIdx; i++) {{
+        var ri = rows[i];
+        var counted = o.counts[ri] === 1;
+        var cat = o.categories[ri];
+        var tr = rowProto.cloneNode(true);
+        if (!counted) tr.classList.add('hidden-row');
+        var tds = tr.children;
+        tds[0].textContent = o.dates[ri];
+        tds[1].textContent = o.titles[ri];
+        var catSel = _catSelProto.cloneNode(true);
+        catSel.dataset.idx = ri;
+        if (allCategories.indexOf(cat) < 0 && cat) {{
+          var extra = document.createElement('option');
+          extra.value = cat;
+          extra.textContent = cat;
+          catSel.appendChild(extra);
+        }}
+        catSel.value = cat;
+        tds[2].appendChild(catSel);
+        tds[3].textContent = fmtMoney(o.amounts[ri]);
+        var cntSel = tds[4].firstElementChild;
+        cntSel.dataset.idx = ri;
+        cntSel.value = counted ? '1' : '0';
+        frag.appendChild(tr);
+      }}
+      if (bottomPad > 0) frag.appendChild(spacer(bottomPad));
+      tbody.replaceChildren(frag);
+    }}
+
+    // Um único listener delegado no tbody (mesmo padrão da conta) em vez de
+    // dois addEventListener por linha re-vinculados a cada render
+    els.tbody.addEventListener('change', function (e) {{
+      var sel = e.target;
+      var idx = parseInt(sel.getAttribute('data-idx'), 10);
+      if (isNaN(idx)) return;
+      if (sel.classList.contains('cat-select')) {{
+        overrides[idx] = overrides[idx] || {{}};
+        overrides[idx].category = sel.value;
+        if (_effCache) _effCache[idx].category = sel.value;
+        if (_soa) {{
+          _soa.categories[idx] = sel.value;
+          _soa.categoriesLc[idx] = sel.value.toLowerCase();
+        }}
+      }} else if (sel.classList.contains('count-select')) {{
+        overrides[idx] = overrides[idx] || {{}};
+        overrides[idx].count = sel.value === '1';
+        if (_effCache) _effCache[idx]._count = overrides[idx].count;
+        if (_soa) _soa.counts[idx] = overrides[idx].count ? 1 : 0;
+      }} else {{
+        return;
+      }}
+      saveOverrides();
+      schedule('all');
+    }});
 
     function renderTable(data) {{
-      var rows = PAYLOAD.expenses.map(function (r, i) {{
-        return {{ date: r.date, title: r.title, amount: r.amount, category: getRowCategory(i), _count: getRowCount(i), _idx: i }};
-      }});
-      if (searchTerm) {{
-        var q = searchTerm.toLowerCase();
-        rows = rows.filter(function (r) {{
-          return r.date.toLowerCase().includes(q) || r.title.toLowerCase().includes(q) || (r.category && r.category.toLowerCase().includes(q)) || r.amount.toString().includes(q);
-        }});
+      var o = soa();
+      var n = o.dates.length;
+      var q = searchTerm ? searchTerm.toLowerCase() : '';
+      var all = new Int32Array(n);
+      var k = 0;
+      for (var i = 0; i < n; i++) {{
+        if (q && o.dates[i].indexOf(q) < 0 && o.titlesLc[i].indexOf(q) < 0 && o.categoriesLc[i].indexOf(q) < 0 && o.amountStr[i].indexOf(q) < 0) continue;
+        if (filterMonthVal && o.ym[i] !== filterMonthVal) continue;
+        if (filterCatVal && o.categories[i] !== filterCatVal) continue;
+        all[k++] = i;
       }}
-      if (filterMonthVal) rows = rows.filter(function (r) {{ return r.date.slice(0, 7) === filterMonthVal; }});
-      if (filterCatVal) rows = rows.filter(function (r) {{ return r.category === filterCatVal; }});
-      rows.sort(function (a, b) {{
-        var va = a[sortKey] !== undefined ? a[sortKey] : a.date, vb = b[sortKey] !== undefined ? b[sortKey] : b.date;
-        if (sortKey === 'amount') return sortDir * (va - vb);
-        if (sortKey === 'date') return sortDir * (va.localeCompare(vb));
-        return sortDir * String(va || '').localeCompare(vb || '');
-      }});
-      var tbody = document.getElementById('tbody');
-      tbody.innerHTML = '';
-      rows.forEach(function (r) {{
-        var tr = document.createElement('tr');
-        if (!r._count) tr.classList.add('hidden-row');
-        var cats = allCategories.indexOf(r.category) >= 0 ? allCategories : allCategories.concat([r.category]);
-        var catOpts = cats.map(function (c) {{ return '<option value="' + escapeHtml(c) + '"' + (c === r.category ? ' selected' : '') + '>' + escapeHtml(c) + '</option>'; }}).join('');
-        var catSelect = '<select data-idx="' + r._idx + '" class="cat-select">' + catOpts + '</select>';
-        var countSelect = '<select data-idx="' + r._idx + '" class="count-select"><option value="1"' + (r._count ? ' selected' : '') + '>Sim</option><option value="0"' + (!r._count ? ' selected' : '') + '>Não</option></select>';
-        tr.innerHTML = '<td>' + r.date + '</td><td>' + escapeHtml(r.title) + '</td><td>' + catSelect + '</td><td class="amount">' + fmtMoney(r.amount) + '</td><td>' + countSelect + '</td>';
-        tbody.appendChild(tr);
-      }});
-      tbody.querySelectorAll('.cat-select').forEach(function (sel) {{
-        sel.addEventListener('change', function () {{
-          var idx = parseInt(sel.getAttribute('data-idx'), 10);
-          overrides[idx] = overrides[idx] || {{}};
-          overrides[idx].category = sel.value;
-          saveOverrides();
-          renderAll();
+      var idxs = all.subarray(0, k);
+      if (sortKey === 'amount') idxs.sort(function (a, b) {{ return sortDir * (o.amounts[a] - o.amounts[b]); }});
+      else if (sortKey === 'title') idxs.sort(function (a, b) {{ return sortDir * o.titles[a].localeCompare(o.titles[b]); }});
+      else idxs.sort(function (a, b) {{ return sortDir * o.dates[a].localeCompare(o.dates[b]); }});
+      _cartaoRows = idxs;
+      renderCartaoWindow();
+      if (!window._cartaoScrollBound) {{
+        window._cartaoScrollBound = true;
+        els.cartaoScroll.addEventListener('scroll', function () {{
+          if (_cartaoScrollRAF) return;
+          _cartaoScrollRAF = requestAnimationFrame(function () {{ _cartaoScrollRAF = 0; renderCartaoWindow(); }});
         }});
-      }});
-      tbody.querySelectorAll('.count-select').forEach(function (sel) {{
-        sel.addEventListener('change', function () {{
-          var idx = parseInt(sel.getAttribute('data-idx'), 10);
-          overrides[idx] = overrides[idx] || {{}};
-          overrides[idx].count = sel.value === '1';
-          saveOverrides();
-          renderAll();
-        }});
-      }});
+      }}
     }}
 
     var filterMonth = document.getElementById('filter-month');
@@ -1308,29 +1926,47 @@ def main():
       }});
     }}
 
-    document.querySelectorAll('#expenses-table th[data-sort]').forEach(function (th) {{
+    els.sortThs.forEach(function (th) {{
       th.addEventListener('click', function () {{
         var key = th.getAttribute('data-sort');
         if (sortKey === key) sortDir = -sortDir; else {{ sortKey = key; sortDir = 1; }}
-        document.querySelectorAll('#expenses-table th[data-sort]').forEach(function (h) {{ h.classList.remove('sorted-asc', 'sorted-desc'); }});
+        els.sortThs.forEach(function (h) {{ h.classList.remove('sorted-asc', 'sorted-desc'); }});
         th.classList.add(sortDir === 1 ? 'sorted-asc' : 'sorted-desc');
-        renderAll();
+        schedule('all');
       }});
     }});
 
-    document.getElementById('search').addEventListener('input', function () {{ searchTerm = this.value.trim(); renderAll(); }});
-    filterMonth.addEventListener('change', function () {{ filterMonthVal = this.value; renderAll(); }});
-    filterCat.addEventListener('change', function () {{ filterCatVal = this.value; renderAll(); }});
+    // Debounce de 120 ms: coalesce teclas rápidas num único re-render
+    var _searchTimer = 0;
+    document.getElementById('search').addEventListener('input', function () {{
+      var v = this.value.trim();
+      clearTimeout(_searchTimer);
+      _searchTimer = setTimeout(function () {{ searchTerm = v; schedule('all'); }}, 120);
+    }});
+    filterMonth.addEventListener('change', function () {{ filterMonthVal = this.value; schedule('all'); }});
+    filterCat.addEventListener('change', function () {{ filterCatVal = this.value; schedule('all'); }});
     if (filterCategoriesCartaoEl) filterCategoriesCartaoEl.addEventListener('change', function () {{
       filterCategoriesCartao = Array.from(this.selectedOptions).map(function (o) {{ return o.value; }}).filter(Boolean);
-      renderAll();
+      schedule('all');
     }});
 
-    var recEl = document.getElementById('recommendations');
-    (PAYLOAD.recommendations || []).forEach(function (text) {{
-      var li = document.createElement('li');
-      li.textContent = text;
-      recEl.appendChild(li);
+    // Expandir/recolher grupos ABC por delegação: um listener por container
+    // cobre tanto o HTML vindo do build quanto o reconstruído pelo JS
+    ['abc-groups', 'conta-abc-groups'].forEach(function (cid) {{
+      var el = document.getElementById(cid);
+      if (!el) return;
+      el.addEventListener('click', function (e) {{
+        var header = e.target.closest('.abc-group-header');
+        if (!header || !el.contains(header)) return;
+        var body = header.nextElementSibling;
+        if (!body) return;
+        body.classList.toggle('collapsed');
+        var t = header.querySelector('.toggle');
+        if (t) {{
+          var collapsed = body.classList.contains('collapsed');
+          t.textContent = t.textContent.replace(collapsed ? '▼' : '▶', collapsed ? '▶' : '▼');
+        }}
+      }});
     }});
 
     document.querySelectorAll('.tab-btn').forEach(function (btn) {{
@@ -1344,14 +1980,21 @@ def main():
       }});
     }});
 
-    renderAll();
+    if (Object.keys(overrides).length) {{
+      renderAll();
+    }} else {{
+      // As seções do cartão já vieram pintadas do build; só a tabela
+      // interativa (selects de categoria/contabilizar) é montada aqui
+      renderTable();
+    }}
     renderContaTab();
     renderConsolidadoTab();
+  }})();
   </script>
 </body>
 </html>
 """
-    OUT_HTML.write_text(html, encoding="utf-8")
+    OUT_HTML.write_text(html_doc, encoding="utf-8")
     print(f"Dashboard gerado: {OUT_HTML}")
     print(f"  Despesas 2025: {len(expenses)} | Total: R$ {total_2025:,.2f}")
 
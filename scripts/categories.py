@@ -2,6 +2,8 @@
 Lista única de categorias e blacklist compartilhados entre cartão e conta corrente.
 """
 
+import re
+
 # Despesas a ocultar (match parcial, case-insensitive) — cartão e conta
 BLACKLIST = [
     "xgrow",
@@ -70,6 +72,10 @@ MASTER_CATEGORIES = list(
 )
 
 
+# Alternação compilada da blacklist: uma varredura do texto em vez de um
+# scan independente por termo
+_BL_RE = re.compile("|".join(re.escape(b) for b in BLACKLIST), re.IGNORECASE)
+
+
 def is_blacklisted(text: str) -> bool:
-    t = (text or "").lower()
-    return any(b in t for b in BLACKLIST)
+    return bool(_BL_RE.search(text or ""))
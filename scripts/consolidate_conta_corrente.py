@@ -15,23 +15,46 @@ import csv
 import json
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 
 SCRIPTS_DIR = Path(__file__).resolve().parent
 if str(SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPTS_DIR))
-from categories import BLACKLIST
+from categories import is_blacklisted
+
+try:
+    import orjson  # serializador em Rust, bem mais rápido que o json da stdlib
+except ImportError:
+    orjson = None
 
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 OUT_JSON = ASSETS / "consolidated_conta_corrente_2025.json"
 
+# Linha como namedtuple (em vez de dict de 6 chaves): ~1/3 da memória por
+# registro durante o processamento; vira dict só na hora do dump
+Row = namedtuple("Row", "date amount entity description category type")
+
+# Padrões da coluna Descrição, compilados uma vez no import (evita o lookup
+# no cache interno do re a cada linha)
+_RE_TR_RECEBIDA = re.compile(r"Transferência Recebida\s*-\s*(.+?)\s*-\s*", re.IGNORECASE)
+_RE_PIX = re.compile(r"Transferência (?:enviada|recebida) pelo Pix\s*-\s*(.+?)\s*-\s*", re.IGNORECASE)
+_RE_BOLETO = re.compile(r"Pagamento de boleto efetuado\s*-\s*(.+)", re.IGNORECASE)
+_RE_FATURA = re.compile(r"Pagamento de fatura", re.IGNORECASE)
+_RE_RESGATE_RDB = re.compile(r"Resgate RDB", re.IGNORECASE)
+_RE_APLICACAO_RDB = re.compile(r"Aplicação RDB", re.IGNORECASE)
+_RE_DEBITO = re.compile(r"Compra no débito\s*-\s*(.+)", re.IGNORECASE)
+
 
 def is_blacklisted_conta(desc: str) -> bool:
-    d = (desc or "").lower()
-    return any(b in d for b in BLACKLIST)
+    return is_blacklisted(desc)
 
 
+@lru_cache(maxsize=4096)
 def parse_amount(s: str) -> float:
     s = (s or "").strip().replace(",", ".")
     try:
@@ -40,9 +63,14 @@ def parse_amount(s: str) -> float:
         return 0.0
 
 
+@lru_cache(maxsize=4096)
 def parse_date(dd_mm_yyyy: str) -> str:
     """Converte DD/MM/YYYY para YYYY-MM-DD."""
     s = (dd_mm_yyyy or "").strip()
+    # Caminho rápido: a forma DD/MM/YYYY vira YYYY-MM-DD por fatiamento puro
+    # (as datas se repetem muito, então o cache resolve a maioria das linhas)
+    if len(s) == 10 and s[2] == "/" and s[5] == "/" and s.replace("/", "").isdigit():
+        return s[6:10] + "-" + s[3:5] + "-" + s[0:2]
     if not s:
         return ""
     parts = s.split("/")
@@ -62,54 +90,53 @@ def extract_entity(desc: str) -> str:
         return "Desconhecido"
 
     # Transferência Recebida - NOME - ...
-    m = re.match(r"Transferência Recebida\s*-\s*(.+?)\s*-\s*", d, re.IGNORECASE)
+    m = _RE_TR_RECEBIDA.match(d)
     if m:
         return m.group(1).strip()
 
     # Transferência enviada/recebida pelo Pix - ENTIDADE - (CNPJ ou •••)
-    m = re.match(r"Transferência (?:enviada|recebida) pelo Pix\s*-\s*(.+?)\s*-\s*", d, re.IGNORECASE)
+    m = _RE_PIX.match(d)
     if m:
         return m.group(1).strip()
 
     # Pagamento de boleto efetuado - NOME
-    m = re.match(r"Pagamento de boleto efetuado\s*-\s*(.+)", d, re.IGNORECASE)
+    m = _RE_BOLETO.match(d)
     if m:
         return m.group(1).strip()
 
     # Pagamento de fatura
-    if re.search(r"Pagamento de fatura", d, re.IGNORECASE):
+    if _RE_FATURA.search(d):
         return "Pagamento de fatura"
 
     # Resgate RDB / Aplicação RDB
-    if re.search(r"Resgate RDB", d, re.IGNORECASE):
+    if _RE_RESGATE_RDB.search(d):
         return "Resgate RDB"
-    if re.search(r"Aplicação RDB", d, re.IGNORECASE):
+    if _RE_APLICACAO_RDB.search(d):
         return "Aplicação RDB"
 
     # Compra no débito - ESTABELECIMENTO
-    m = re.match(r"Compra no débito\s*-\s*(.+)", d, re.IGNORECASE)
+    m = _RE_DEBITO.match(d)
     if m:
         return m.group(1).strip()
 
     return d[:80] if len(d) > 80 else d
 
 
-def categorize_conta(desc: str, amount: float, entity: str = "") -> str:
-    """Atribui categoria por entidade/descrição; só categorias da lista mestra (sem Transferências/PIX)."""
-    d = (desc or "").lower()
-    ent = (entity or "").lower()
+def _categorize_entrada(d: str) -> str:
+    """Entradas — categorias de receita."""
+    if "transferência recebida" in d or "transferência recebida pelo pix" in d:
+        if "rodrigo ribas" in d or "nu pagamentos" in d:
+            return "Salário / Transferência"
+        return "Recebimento de Clientes"  # PIX de terceiros
+    if "resgate rdb" in d:
+        return "Investimentos (resgate)"
+    return "Outras entradas"
 
-    # Entradas — categorias de receita
-    if amount > 0:
-        if "transferência recebida" in d or "transferência recebida pelo pix" in d:
-            if "rodrigo ribas" in d or "nu pagamentos" in d:
-                return "Salário / Transferência"
-            return "Recebimento de Clientes"  # PIX de terceiros
-        if "resgate rdb" in d:
-            return "Investimentos (resgate)"
-        return "Outras entradas"
-
-    # Saídas — categorias da lista mestra
+
+def _categorize_saida(d: str, desc: str, ent: str) -> str:
+    """Saídas — ramos ordenados por frequência medida nos extratos (fatura e
+    PIX dominam), com as exceções por palavra-chave que precisam vencer o ramo
+    PIX genérico (impostos/telefonia/saneamento chegam como PIX) antes dele."""
     if "pagamento de fatura" in d:
         return "Pagamento cartão"
     if "receita federal" in d or "ipva" in d or "sefaz" in d or "receita federal" in ent:
@@ -118,23 +145,9 @@ def categorize_conta(desc: str, amount: float, entity: str = "") -> str:
         return "Comunicação"
     if "cia estadual de distribui" in d or "cia riograndense de saneamento" in d:
         return "Saneamento básico"
-    if "aplicação rdb" in d or "aplicacao rdb" in d:
-        return "Investimentos"
-    if "pagamento de boleto" in d:
-        if "consorcio" in d or "consórcio" in d or "consorcio" in ent:
-            return "Financiamento e consórcio"
-        return "Boletos e outros"
-    if "compra no débito" in d or "compra no debito" in d:
-        if "posto" in d or "gasolina" in d:
-            return "Combustível"
-        if "supermerc" in d or "mercado" in d or "hortifruti" in d:
-            return "Mercado"
-        if "restaurante" in d or "lanch" in d or "padaria" in d:
-            return "Restaurante" if "restaurante" in d or "lanch" in d else "Lanche padaria e outros alimentos"
-        return "Outros"
     # PIX enviado — inferir por entidade
     if "transferência enviada pelo pix" in d:
-        if "•••" in (desc or ""):
+        if "•••" in desc:
             return "Presentes"  # PIX pessoal; usuário pode editar para Despesas esporádicas etc.
         if "mercadopago" in d or "pagseguro" in d:
             return "Outros"  # pagamentos online; usuário pode categorizar
@@ -145,35 +158,96 @@ def categorize_conta(desc: str, amount: float, entity: str = "") -> str:
         if "edison" in d or "fornecedor" in ent or "kirsten" in d:
             return "Pagamento de Fornecedores"
         return "Outros"
+    if "compra no débito" in d or "compra no debito" in d:
+        if "posto" in d or "gasolina" in d:
+            return "Combustível"
+        if "supermerc" in d or "mercado" in d or "hortifruti" in d:
+            return "Mercado"
+        if "restaurante" in d or "lanch" in d or "padaria" in d:
+            return "Restaurante" if "restaurante" in d or "lanch" in d else "Lanche padaria e outros alimentos"
+        return "Outros"
+    if "pagamento de boleto" in d:
+        if "consorcio" in d or "consórcio" in d or "consorcio" in ent:
+            return "Financiamento e consórcio"
+        return "Boletos e outros"
+    if "aplicação rdb" in d or "aplicacao rdb" in d:
+        return "Investimentos"
     return "Outros"
 
 
-def load_all_conta_corrente() -> list[dict]:
+def categorize_conta(desc: str, amount: float, entity: str = "") -> str:
+    """Atribui categoria por entidade/descrição; só categorias da lista mestra (sem Transferências/PIX)."""
+    d = (desc or "").lower()
+    if amount > 0:
+        return _categorize_entrada(d)
+    return _categorize_saida(d, desc or "", (entity or "").lower())
+
+
+# Descrições se repetem centenas de vezes nos extratos: internar faz cópias
+# idênticas compartilharem um único objeto, e a categorização vira um lookup
+# (a entidade deriva da própria descrição, então (desc, sinal) basta de chave)
+_desc_cache: dict[str, str] = {}
+_cat_memo: dict[tuple[str, bool], str] = {}
+
+
+def _intern_desc(s: str) -> str:
+    v = _desc_cache.get(s)
+    if v is None:
+        _desc_cache[s] = v = sys.intern(s)
+    return v
+
+
+def categorize_conta_cached(desc: str, amount: float, entity: str = "") -> str:
+    key = (desc, amount > 0)
+    c = _cat_memo.get(key)
+    if c is None:
+        _cat_memo[key] = c = categorize_conta(desc, amount, entity)
+    return c
+
+
+def _parse_one(path: Path) -> list[Row]:
+    """Lê e categoriza um único extrato (top-level para ser picklável)."""
     rows = []
-    for p in sorted(ASSETS.glob("NU_26372425_*.csv")):
-        with open(p, newline="", encoding="utf-8") as f:
-            r = csv.DictReader(f)
-            for row in r:
-                data_str = (row.get("Data") or "").strip()
-                date_iso = parse_date(data_str)
-                if not date_iso.startswith("2025-"):
-                    continue
-                valor = parse_amount(row.get("Valor") or "0")
-                desc = (row.get("Descrição") or row.get("Descricao") or "").strip()
-                if is_blacklisted_conta(desc):
-                    continue
-                entity = extract_entity(desc)
-                category = categorize_conta(desc, valor, entity)
-                tipo = "entrada" if valor >= 0 else "saida"
-                rows.append({
-                    "date": date_iso,
-                    "amount": round(valor, 2),
-                    "entity": entity,
-                    "description": desc,
-                    "category": category,
-                    "type": tipo,
-                })
-    return sorted(rows, key=lambda x: (x["date"], x["amount"], x["description"]))
+    with open(path, newline="", encoding="utf-8") as f:
+        r = csv.reader(f)
+        # csv.reader + índices fixos: evita montar um dict por linha
+        header = next(r, None)
+        if not header:
+            return rows
+        h = {name.strip().lower(): i for i, name in enumerate(header)}
+        i_data = h["data"]
+        i_valor = h["valor"]
+        i_desc = h.get("descrição", h.get("descricao"))
+        for row in r:
+            if len(row) <= i_valor:
+                continue
+            date_iso = parse_date(row[i_data])
+            if date_iso[:5] != "2025-":
+                continue
+            valor = parse_amount(row[i_valor])
+            desc = _intern_desc((row[i_desc] if i_desc is not None and i_desc < len(row) else "").strip())
+            if is_blacklisted_conta(desc):
+                continue
+            entity = extract_entity(desc)
+            category = categorize_conta_cached(desc, valor, entity)
+            tipo = "entrada" if valor >= 0 else "saida"
+            rows.append(Row(date_iso, round(valor, 2), entity, desc, category, tipo))
+    return rows
+
+
+def load_all_conta_corrente() -> list[Row]:
+    files = sorted(ASSETS.glob("NU_26372425_*.csv"))
+    # Extratos são independentes: o parse (regex + categorização) de cada
+    # arquivo vai para um processo; com um arquivo só, não paga o startup do pool
+    if len(files) > 1:
+        with ProcessPoolExecutor() as ex:
+            chunks = list(ex.map(_parse_one, files))
+    else:
+        chunks = [_parse_one(p) for p in files]
+    rows = list(chain.from_iterable(chunks))
+    # sort in-place com attrgetter (chave em C, sem lambda nem lista nova)
+    rows.sort(key=attrgetter("date", "amount", "description"))
+    return rows
 
 
 def main():
@@ -182,8 +256,15 @@ def main():
         print("Nenhuma transação de 2025 encontrada nos NU_*.csv")
         return
 
-    entradas = sum(t["amount"] for t in transactions if t["amount"] > 0)
-    saidas = sum(-t["amount"] for t in transactions if t["amount"] < 0)
+    # Um único passe acumula os dois totais (em vez de dois sum() sobre a lista)
+    entradas = 0.0
+    saidas = 0.0
+    for t in transactions:
+        a = t.amount
+        if a > 0:
+            entradas += a
+        else:
+            saidas -= a
     saldo = round(entradas - saidas, 2)
 
     payload = {
@@ -194,11 +275,14 @@ def main():
             "saidas_total": round(saidas, 2),
             "saldo_2025": saldo,
         },
-        "transactions": transactions,
+        "transactions": [t._asdict() for t in transactions],
     }
 
-    with open(OUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        OUT_JSON.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(OUT_JSON, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
 
     print(f"Conta Corrente 2025 consolidada: {OUT_JSON}")
     print(f"  Lançamentos: {len(transactions)}")